@@ -2,13 +2,13 @@
 RBAC-aware tool executor.
 
 Maps tool names to service-layer calls and checks user permissions
-before executing any tool.  Services return JSON strings; we parse
-them back to dicts before returning to the orchestrator.
+before executing any tool.  Services return plain dicts and lists,
+which are handed to the orchestrator as-is; it encodes each tool
+result to JSON once.
 """
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
@@ -21,10 +21,22 @@ from app.services.payroll_service import PayrollService
 from app.services.hr_policy_service import HRPolicyService
 from app.services.update_request_service import UpdateRequestService
 from app.services.appraisal_service import AppraisalService
+from app.repositories.employee_repo import EmployeeRepository
 from app.repositories.user_repo import UserRepository
 
 logger = logging.getLogger("hrms.tool_executor")
 
+# Stateless services/repos — built once per process, shared by every call
+_emp_svc = EmployeeService()
+_leave_svc = LeaveService()
+_att_svc = AttendanceService()
+_pay_svc = PayrollService()
+_hr_svc = HRPolicyService()
+_user_repo = UserRepository()
+_update_req_svc = UpdateRequestService()
+_appraisal_svc = AppraisalService()
+_emp_repo = EmployeeRepository()
+
 # ---------------------------------------------------------------------------
 # Permission matrix – map each tool to the permission it requires
 # ---------------------------------------------------------------------------
@@ -46,12 +58,14 @@ TOOL_PERMISSION_MAP: dict[str, str | None] = {
     "get_hr_policy": "view_employee",
     "get_hr_policy_history": "view_employee",
     "compute_salary_breakup": "view_payroll",
+    "run_payroll": "manage_employee",
     # Employee tax regime
     "set_employee_tax_regime": "apply_leave",  # any authenticated user can set their own
     # Update requests
     "submit_update_request": "apply_leave",  # any authenticated user can submit
     "list_update_requests": "view_employee",
     "review_update_request": "manage_employee",
+    "bulk_review_update_requests": "manage_employee",
     # Appraisals
     "initiate_appraisal": "manage_employee",
     "complete_appraisal": "manage_employee",
@@ -67,9 +81,11 @@ WRITE_TOOLS = {
     "initiate_resignation",
     "assign_role",
     "set_hr_policy",
+    "run_payroll",
     "set_employee_tax_regime",
     "submit_update_request",
     "review_update_request",
+    "bulk_review_update_requests",
     "initiate_appraisal",
     "complete_appraisal",
 }
@@ -85,11 +101,6 @@ async def _audit(action: str, user: User, target: str, details: dict | None = No
     ).insert()
 
 
-def _parse(json_str: str) -> dict | list:
-    """Safely parse a JSON string from a service."""
-    return json.loads(json_str)
-
-
 async def execute_tool(
     tool_name: str,
     arguments: dict[str, Any],
@@ -104,81 +115,72 @@ async def execute_tool(
 
     # ---- Permission check --------------------------------------------------
     required_permission = TOOL_PERMISSION_MAP.get(tool_name)
-    if required_permission:
-        user_perms = RolePermissions.get_permissions(user.role)
-        if required_permission not in user_perms:
-            return {
-                "error": (
-                    f"Access denied. Your role '{user.role.value}' does not have "
-                    f"'{required_permission}' permission."
-                )
-            }
+    if required_permission and not RolePermissions.has_permission(user.role, required_permission):
+        return {
+            "error": (
+                f"Access denied. Your role '{user.role.value}' does not have "
+                f"'{required_permission}' permission."
+            )
+        }
 
-    # ---- Service instances --------------------------------------------------
-    emp_svc = EmployeeService()
-    leave_svc = LeaveService()
-    att_svc = AttendanceService()
-    pay_svc = PayrollService()
-    hr_svc = HRPolicyService()
-    user_repo = UserRepository()
-    update_req_svc = UpdateRequestService()
-    appraisal_svc = AppraisalService()
+    # ---- Canonicalise emp_code once; everything downstream assumes upper-case
+    if isinstance(arguments.get("emp_code"), str):
+        arguments = {**arguments, "emp_code": arguments["emp_code"].strip().upper()}
 
     try:
         # ---- Dispatch -------------------------------------------------------
         if tool_name == "lookup_employee":
-            result = _parse(await emp_svc.lookup(arguments["query"]))
-            return result if isinstance(result, dict) else {"data": result}
+            return await _emp_svc.lookup(arguments["query"])
 
         elif tool_name == "list_employees_by_department":
-            result = _parse(await emp_svc.list_by_department(arguments["department"]))
+            result = await _emp_svc.list_by_department(arguments["department"])
             if isinstance(result, list) and not result:
                 return {"message": f"No employees in '{arguments['department']}'."}
             return {"employees": result} if isinstance(result, list) else result
 
         elif tool_name == "get_leave_records":
-            result = _parse(await leave_svc.get_records(
+            result = await _leave_svc.get_records(
                 arguments["emp_code"],
                 status=arguments.get("status"),
-            ))
-            if isinstance(result, list) and not result:
+            )
+            if not result:
                 return {"message": f"No leave records for {arguments['emp_code']}."}
-            return {"leave_records": result} if isinstance(result, list) else result
+            return {"leave_records": result}
 
         elif tool_name == "apply_leave":
-            result = _parse(await leave_svc.apply_leave(
+            result = await _leave_svc.apply_leave(
                 emp_code=arguments["emp_code"],
                 leave_type=arguments["leave_type"],
                 start_date=arguments["start_date"],
                 end_date=arguments["end_date"],
                 reason=arguments["reason"],
-            ))
+            )
             await _audit("apply_leave", user, arguments["emp_code"], arguments)
             return result
 
         elif tool_name == "approve_or_reject_leave":
-            result = _parse(await leave_svc.approve_or_reject(
+            result = await _leave_svc.approve_or_reject(
                 emp_code=arguments["emp_code"],
                 start_date=arguments["start_date"],
                 action=arguments["action"],
                 approved_by=user.email,
-            ))
+            )
             await _audit("approve_reject_leave", user, arguments["emp_code"], arguments)
             return result
 
         elif tool_name == "get_attendance":
-            result = _parse(await att_svc.get_records(
+            result = await _att_svc.get_records(
                 arguments["emp_code"],
                 target_date=arguments.get("date"),
-            ))
-            if isinstance(result, list) and not result:
+            )
+            if not result:
                 return {"message": f"No attendance records for {arguments['emp_code']}."}
-            return {"attendance": result} if isinstance(result, list) else result
+            return {"attendance": result}
 
         elif tool_name == "get_payroll":
-            result = _parse(await pay_svc.get_slip(
+            result = await _pay_svc.get_slip(
                 arguments["emp_code"], arguments.get("month"),
-            ))
+            )
             if isinstance(result, list) and not result:
                 return {"message": f"No payroll records for {arguments['emp_code']}."}
             return {"payroll": result} if isinstance(result, list) else result
@@ -187,15 +189,13 @@ async def execute_tool(
             page = arguments.get("page", 1)
             page_size = min(arguments.get("page_size", 10), 25)
             search = arguments.get("search")
-            result = _parse(await emp_svc.list_all_paginated(page, page_size, search))
-            return result
+            return await _emp_svc.list_all_paginated(page, page_size, search)
 
         elif tool_name == "get_company_stats":
-            result = _parse(await emp_svc.get_company_stats())
-            return result
+            return await _emp_svc.get_company_stats()
 
         elif tool_name == "add_employee":
-            result = _parse(await emp_svc.add_employee(
+            result = await _emp_svc.add_employee(
                 emp_code=arguments["emp_code"],
                 name=arguments["name"],
                 email=arguments["email"],
@@ -220,12 +220,13 @@ async def execute_tool(
                 bank_account=arguments.get("bank_account"),
                 bank_name=arguments.get("bank_name"),
                 ifsc_code=arguments.get("ifsc_code"),
-            ))
+            )
             # Auto-generate payroll from CTC using active HR policy
             from datetime import datetime
-            current_month = datetime.utcnow().strftime("%Y-%m")
+            now = datetime.utcnow()
+            current_month = now.strftime("%Y-%m")
             try:
-                payroll_result = await hr_svc.create_payroll_from_ctc(
+                payroll_result = await _hr_svc.create_payroll_from_ctc(
                     emp_code=arguments["emp_code"],
                     annual_ctc=arguments["salary"],
                     month=current_month,
@@ -241,7 +242,7 @@ async def execute_tool(
 
             # Auto-credit annual leaves from policy
             try:
-                leave_credits = await hr_svc.get_leave_credits()
+                leave_credits = await _hr_svc.get_leave_credits()
                 from app.models.leave import LeaveRecord
                 for leave_type, days in [
                     ("casual", leave_credits["casual_leave"]),
@@ -249,10 +250,10 @@ async def execute_tool(
                     ("earned", leave_credits["earned_leave"]),
                 ]:
                     await LeaveRecord(
-                        emp_code=arguments["emp_code"].upper(),
+                        emp_code=arguments["emp_code"],
                         leave_type=leave_type,
-                        start_date=datetime.utcnow().date(),
-                        end_date=datetime.utcnow().date(),
+                        start_date=now.date(),
+                        end_date=now.date(),
                         status="credit",
                         reason=f"Annual {leave_type} leave credit ({days} days) as per HR policy",
                         days_credited=days,
@@ -271,30 +272,30 @@ async def execute_tool(
 
         elif tool_name == "update_employee":
             updates = {k: v for k, v in arguments.items() if k != "emp_code" and v is not None}
-            result = _parse(await emp_svc.update_employee(arguments["emp_code"], **updates))
+            result = await _emp_svc.update_employee(arguments["emp_code"], **updates)
             await _audit("update_employee", user, arguments["emp_code"], arguments)
             return result
 
         elif tool_name == "initiate_resignation":
-            result = _parse(await emp_svc.initiate_resignation(
+            result = await _emp_svc.initiate_resignation(
                 emp_code=arguments["emp_code"],
                 resignation_date=arguments["resignation_date"],
                 reason=arguments["reason"],
-            ))
+            )
             await _audit("initiate_resignation", user, arguments["emp_code"], arguments)
             return result
 
         elif tool_name == "assign_role":
-            target_user = await user_repo.find_by_email(arguments["email"])
+            target_user = await _user_repo.find_by_email(arguments["email"])
             if target_user is None:
                 return {"error": f"User with email '{arguments['email']}' not found."}
-            await user_repo.update_role(arguments["email"], UserRole(arguments["role"]))
+            await _user_repo.update_role(arguments["email"], UserRole(arguments["role"]))
             await _audit("assign_role", user, arguments["email"], arguments)
             return {"message": f"Role updated to '{arguments['role']}' for {arguments['email']}."}
 
         # ── HR Policy tools ─────────────────────────────
         elif tool_name == "set_hr_policy":
-            result = await hr_svc.set_policy(
+            result = await _hr_svc.set_policy(
                 state=arguments["state"],
                 is_metro=arguments.get("is_metro", True),
                 tax_regime=arguments.get("tax_regime", "new"),
@@ -335,7 +336,7 @@ async def execute_tool(
             return result
 
         elif tool_name == "get_hr_policy":
-            policy = await hr_svc.get_active_policy()
+            policy = await _hr_svc.get_active_policy()
             b = policy.salary_breakup
             lp = policy.leave_policy
             return {
@@ -381,25 +382,40 @@ async def execute_tool(
             }
 
         elif tool_name == "get_hr_policy_history":
+            if arguments.get("version") is not None:
+                detail = await _hr_svc.get_policy_version(arguments["version"])
+                if not detail:
+                    return {"error": f"Policy version {arguments['version']} not found."}
+                return {"policy": detail}
             limit = arguments.get("limit", 10)
-            history = await hr_svc.get_policy_history(limit=limit)
+            history = await _hr_svc.get_policy_history(limit=limit)
             if not history:
                 return {"message": "No policy history found. Set an HR policy first."}
             return {"policy_history": history, "total_versions": len(history)}
 
         elif tool_name == "compute_salary_breakup":
-            result = await hr_svc.compute_salary_breakup(
+            result = await _hr_svc.compute_salary_breakup(
                 arguments["annual_ctc"],
                 tax_regime=arguments.get("tax_regime"),
             )
             return result
 
+        elif tool_name == "run_payroll":
+            from datetime import datetime as _dt
+            month = arguments.get("month") or _dt.utcnow().strftime("%Y-%m")
+            try:
+                _dt.strptime(month, "%Y-%m")
+            except ValueError:
+                return {"error": f"Invalid month '{month}'. Use YYYY-MM, e.g. 2026-01."}
+            result = await _hr_svc.run_payroll(month)
+            if result.get("created"):
+                await _audit("run_payroll", user, month, arguments)
+            return result
+
         # ── Employee Tax Regime ───────────────────────
         elif tool_name == "set_employee_tax_regime":
-            from app.repositories.employee_repo import EmployeeRepository
             from datetime import datetime as _dt
-            emp_repo = EmployeeRepository()
-            emp = await emp_repo.find_by_emp_code(arguments["emp_code"].upper())
+            emp = await _emp_repo.find_by_emp_code(arguments["emp_code"])
             if not emp:
                 return {"error": f"Employee {arguments['emp_code']} not found."}
             regime = arguments["tax_regime"].lower()
@@ -407,7 +423,7 @@ async def execute_tool(
                 return {"error": "tax_regime must be 'new' or 'old'."}
             emp.tax_regime = regime
             emp.updated_at = _dt.utcnow()
-            await emp_repo.update(emp)
+            await _emp_repo.update(emp)
             await _audit("set_employee_tax_regime", user, arguments["emp_code"], arguments)
             return {
                 "success": True,
@@ -416,7 +432,7 @@ async def execute_tool(
 
         # ── Update Request tools ─────────────────────────
         elif tool_name == "submit_update_request":
-            result = await update_req_svc.submit_request(
+            result = await _update_req_svc.submit_request(
                 emp_code=arguments["emp_code"],
                 fields=arguments["fields"],
                 reason=arguments["reason"],
@@ -426,7 +442,7 @@ async def execute_tool(
             return result
 
         elif tool_name == "list_update_requests":
-            results = await update_req_svc.list_requests(
+            results = await _update_req_svc.list_requests(
                 status=arguments.get("status"),
                 emp_code=arguments.get("emp_code"),
             )
@@ -435,7 +451,7 @@ async def execute_tool(
             return {"update_requests": results, "total": len(results)}
 
         elif tool_name == "review_update_request":
-            result = await update_req_svc.review_request(
+            result = await _update_req_svc.review_request(
                 request_id=arguments["request_id"],
                 action=arguments["action"],
                 reviewer_email=user.email,
@@ -445,9 +461,20 @@ async def execute_tool(
                 await _audit("review_update_request", user, arguments.get("request_id", ""), arguments)
             return result
 
+        elif tool_name == "bulk_review_update_requests":
+            result = await _update_req_svc.review_requests_bulk(
+                request_ids=arguments["request_ids"],
+                action=arguments["action"],
+                reviewer_email=user.email,
+                comment=arguments.get("comment"),
+            )
+            if result.get("success"):
+                await _audit("bulk_review_update_requests", user, ", ".join(arguments["request_ids"]), arguments)
+            return result
+
         # ── Appraisal tools ──────────────────────────────
         elif tool_name == "initiate_appraisal":
-            result = await appraisal_svc.initiate_appraisal(
+            result = await _appraisal_svc.initiate_appraisal(
                 emp_code=arguments["emp_code"],
                 appraisal_cycle=arguments["appraisal_cycle"],
                 initiated_by=user.email,
@@ -458,7 +485,7 @@ async def execute_tool(
             return result
 
         elif tool_name == "complete_appraisal":
-            result = await appraisal_svc.complete_appraisal(
+            result = await _appraisal_svc.complete_appraisal(
                 emp_code=arguments["emp_code"],
                 appraisal_cycle=arguments["appraisal_cycle"],
                 rating=arguments["rating"],
@@ -476,7 +503,7 @@ async def execute_tool(
             return result
 
         elif tool_name == "get_appraisal_history":
-            results = await appraisal_svc.get_appraisal_history(
+            results = await _appraisal_svc.get_appraisal_history(
                 emp_code=arguments.get("emp_code"),
                 limit=arguments.get("limit", 20),
             )
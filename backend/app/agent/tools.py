@@ -7,7 +7,7 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "lookup_employee",
-            "description": "Look up an employee by emp_code or name. Returns employee profile.",
+            "description": "Look up an employee by emp_code or name. Returns employee profile. Optional fields that are not set are omitted, so a missing key (e.g. phone or bank_account) means the value is not on record.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -123,7 +123,7 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "list_all_employees",
-            "description": "List all active employees with pagination and optional search. HR admin, manager, and super admin only. Returns a page of employees and pagination metadata (total, page count). Use search to filter by name, emp_code, department, or designation.",
+            "description": "List all active employees with pagination and optional search. HR admin, manager, and super admin only. Returns a page of employees and pagination metadata (total, page count). Use search to filter by name, emp_code, department, or designation. Search matches whole words only ('Eng' does not match 'Engineering'); an emp_code like 'EMP01' matches as a prefix and bare digits like '01' match anywhere in the emp_code.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -137,7 +137,7 @@ TOOL_DEFINITIONS = [
                     },
                     "search": {
                         "type": "string",
-                        "description": "Optional search term to filter by name, emp_code, department, or designation.",
+                        "description": "Optional search term to filter by name, emp_code, department, or designation. Whole words only, except emp_code prefixes and digits.",
                     },
                 },
             },
@@ -371,12 +371,16 @@ TOOL_DEFINITIONS = [
             "name": "get_hr_policy_history",
             "description": (
                 "View the change history of the HR policy — who changed what and when. "
-                "Shows all past policy versions with diffs. Useful for auditing policy changes."
+                "Shows all past policy versions with diffs. Each version lists only the change "
+                "that produced it, not the cumulative history up to that point. "
+                "Useful for auditing policy changes. "
+                "Pass version to get one version in full, including state-wise PT and leave rules."
             ),
             "parameters": {
                 "type": "object",
                 "properties": {
                     "limit": {"type": "integer", "description": "Max number of history entries to return. Default 10."},
+                    "version": {"type": "integer", "description": "Return only this policy version, with full detail."},
                 },
             },
         },
@@ -401,6 +405,24 @@ TOOL_DEFINITIONS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "run_payroll",
+            "description": (
+                "Generate the monthly payroll slip for every active employee from their CTC, "
+                "using the active HR policy and each employee's chosen tax regime. "
+                "Employees who already have a slip for that month are left untouched. "
+                "Only HR admin and super admin can do this."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "month": {"type": "string", "description": "Month YYYY-MM, e.g. 2026-01. Optional — defaults to the current month."},
+                },
+            },
+        },
+    },
     # ── Employee Tax Regime Choice ──────────────────
     {
         "type": "function",
@@ -481,6 +503,30 @@ TOOL_DEFINITIONS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "bulk_review_update_requests",
+            "description": (
+                "Approve or reject several pending profile update requests in one go. Only HR admin and super admin can do this. "
+                "On approval, changes are applied to the employee records; when several requests touch the same employee, "
+                "the most recent one wins. Ids that are not pending are reported as skipped."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "request_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The update request IDs to review.",
+                    },
+                    "action": {"type": "string", "description": "'approve' or 'reject'."},
+                    "comment": {"type": "string", "description": "Optional review comment, applied to every request."},
+                },
+                "required": ["request_ids", "action"],
+            },
+        },
+    },
     # ── Appraisal tools ──────────────────────────────────
     {
         "type": "function",
@@ -48,13 +48,14 @@ class AuthService:
         if len(password) < 6:
             raise BadRequestException("Password must be at least 6 characters.")
 
+        now = datetime.utcnow()
         user = User(
             email=email,
             name=name,
             hashed_password=self._hash_password(password),
             role=UserRole.EMPLOYEE,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
         await self._repo.create(user)
         return self._build_tokens(user)
@@ -88,6 +89,7 @@ class AuthService:
                 await self._repo.update(user)
             else:
                 # Create new user
+                now = datetime.utcnow()
                 user = User(
                     email=email,
                     name=name,
@@ -95,8 +97,8 @@ class AuthService:
                     sso_profiles=[
                         SSOProfile(provider=provider, provider_user_id=provider_user_id, email=email, name=name, avatar_url=avatar_url)
                     ],
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow(),
+                    created_at=now,
+                    updated_at=now,
                 )
                 await self._repo.create(user)
 
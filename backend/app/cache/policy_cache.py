@@ -0,0 +1,64 @@
+"""In-process cache for the active HR policy.
+
+Every salary / payroll / leave calculation reads the active HRPolicy; caching
+it for a short TTL turns those per-call MongoDB round-trips into a memory
+read. Writers call `invalidate_policy_cache` / `set_cached_policy` so the
+local process never serves a superseded policy; other processes pick up
+changes within the TTL.
+
+Refreshes are serialised on `policy_lock` so a burst of concurrent misses
+costs one query, and an expired entry can be revalidated against the active
+policy's `_id` (a projection) instead of reloading the whole document.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.models.hr_policy import HRPolicy
+
+# (monotonic timestamp when cached, policy)
+_entry: Optional[tuple[float, HRPolicy]] = None
+
+# Held while (re)loading the policy from MongoDB
+policy_lock = asyncio.Lock()
+
+
+def get_cached_policy() -> Optional[HRPolicy]:
+    """Return the cached active policy, or None if missing / expired."""
+    if _entry is None:
+        return None
+    cached_at, policy = _entry
+    if time.monotonic() - cached_at >= settings.POLICY_CACHE_TTL_SECONDS:
+        return None
+    return policy
+
+
+def get_stale_policy() -> Optional[HRPolicy]:
+    """Return the cached policy regardless of age (for revalidation)."""
+    return _entry[1] if _entry is not None else None
+
+
+def set_cached_policy(policy: HRPolicy) -> None:
+    """Store *policy* as the current active policy.
+
+    Its slab tables (struct-of-arrays form of both regimes' tax slabs) and
+    breakup ratios are built here, once per cached policy, rather than on the
+    first breakup/TDS call.
+    """
+    global _entry
+    policy.slab_table("new")
+    policy.slab_table("old")
+    policy.breakup_ratios()
+    _entry = (time.monotonic(), policy)
+
+
+def invalidate_policy_cache() -> None:
+    """Drop the cached policy (called whenever the active policy changes)."""
+    global _entry
+    _entry = None
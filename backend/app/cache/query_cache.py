@@ -13,6 +13,7 @@ from typing import Any, Optional
 
 from beanie import Document
 from pymongo import IndexModel, ASCENDING
+from pydantic import Field
 
 from app.config import settings
 
@@ -25,8 +26,10 @@ class CachedQuery(Document):
     reply: str
     tool_used: Optional[str] = None
     data: Optional[Any] = None
-    created_at: datetime = datetime.utcnow()
-    expires_at: datetime = datetime.utcnow() + timedelta(seconds=settings.CACHE_TTL_SECONDS)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(
+        default_factory=lambda: datetime.utcnow() + timedelta(seconds=settings.CACHE_TTL_SECONDS)
+    )
 
     class Settings:
         name = "query_cache"
@@ -62,8 +65,9 @@ async def set_cache(query: str, reply: str, tool_used: Optional[str] = None, dat
         existing.reply = reply
         existing.tool_used = tool_used
         existing.data = data
-        existing.created_at = datetime.utcnow()
-        existing.expires_at = datetime.utcnow() + timedelta(seconds=settings.CACHE_TTL_SECONDS)
+        now = datetime.utcnow()
+        existing.created_at = now
+        existing.expires_at = now + timedelta(seconds=settings.CACHE_TTL_SECONDS)
         await existing.save()
     else:
         doc = CachedQuery(
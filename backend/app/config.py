@@ -22,6 +22,11 @@ class Settings(BaseSettings):
     # ── MongoDB ──
     MONGODB_URI: str = "mongodb://mongo:27017"
     MONGODB_DB_NAME: str = "hrms"
+    MONGODB_MIN_POOL_SIZE: int = 8
+    MONGODB_MAX_POOL_SIZE: int = 50
+    MONGODB_MAX_IDLE_TIME_MS: int = 30_000  # recycle idle pooled connections
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5_000  # fail a checkout rather than queue forever
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 3_000  # fail fast when Mongo is unreachable
 
     # ── OpenAI ──
     OPENAI_API_KEY: str = ""
@@ -49,6 +54,12 @@ class Settings(BaseSettings):
 
     # ── Cache ──
     CACHE_TTL_SECONDS: int = 300  # 5 minutes default TTL
+    POLICY_CACHE_TTL_SECONDS: int = 60  # in-process active HR policy cache
+
+    # ── Uploads ──
+    # Internal nginx location for X-Accel-Redirect (e.g. "/internal-uploads/").
+    # Empty → files are streamed by the app itself.
+    UPLOADS_ACCEL_REDIRECT_PREFIX: str = ""
 
     # ── CORS ──
     CORS_ORIGINS: list[str] = ["*"]
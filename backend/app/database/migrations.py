@@ -0,0 +1,89 @@
+"""One-off data migrations, run on startup after Beanie is initialised.
+
+Each migration only touches documents still in the old shape and writes with
+upserts, so re-running it (or resuming after a crash) is harmless.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from app.models.employee import Employee, EmployeeDocument
+from app.models.hr_policy import HRPolicy, HRPolicyChangeLog
+
+logger = logging.getLogger("hrms.migrations")
+
+
+async def migrate_employee_documents() -> None:
+    """Move embedded ``employees.documents[]`` into ``employee_documents``."""
+    emp_coll = Employee.get_motor_collection()
+    ops: list[UpdateOne] = []
+    emp_ids = []
+    async for row in emp_coll.find(
+        {"documents": {"$exists": True}}, {"emp_code": 1, "documents": 1}
+    ):
+        emp_ids.append(row["_id"])
+        for doc in row.get("documents") or []:
+            ops.append(UpdateOne(
+                {"emp_code": row["emp_code"], "file_url": doc["file_url"]},
+                {"$setOnInsert": {
+                    "doc_type": doc["doc_type"],
+                    "file_name": doc["file_name"],
+                    "uploaded_at": doc.get("uploaded_at") or datetime.utcnow(),
+                }},
+                upsert=True,
+            ))
+    if not emp_ids:
+        return
+
+    # Copy first; the old arrays are only dropped once every row is in place
+    if ops:
+        await EmployeeDocument.get_motor_collection().bulk_write(ops, ordered=False)
+    await emp_coll.update_many({"_id": {"$in": emp_ids}}, {"$unset": {"documents": ""}})
+    logger.info("Migrated %d embedded document(s) from %d employee(s).", len(ops), len(emp_ids))
+
+
+async def migrate_policy_change_history() -> None:
+    """Explode embedded ``hr_policies.change_history`` into ``hr_policy_changes``.
+
+    Each version carried the full cumulative list, so entry ``i`` of a
+    version-``V`` list of length ``L`` is the change that produced version
+    ``V - (L - 1 - i)``. Older versions repeat the same entries; the upsert
+    key collapses them to one row per change.
+    """
+    pol_coll = HRPolicy.get_motor_collection()
+    ops: list[UpdateOne] = []
+    pol_ids = []
+    async for row in pol_coll.find(
+        {"change_history": {"$exists": True}}, {"version": 1, "change_history": 1}
+    ):
+        pol_ids.append(row["_id"])
+        history = row.get("change_history") or []
+        first = row["version"] - len(history) + 1
+        for offset, log in enumerate(history):
+            changed_at = log.get("changed_at") or datetime.utcnow()
+            ops.append(UpdateOne(
+                {"policy_version": first + offset, "changed_at": changed_at},
+                {"$setOnInsert": {
+                    "changed_by": log["changed_by"],
+                    "reason": log.get("reason"),
+                    "changes": log.get("changes") or [],
+                }},
+                upsert=True,
+            ))
+    if not pol_ids:
+        return
+
+    if ops:
+        await HRPolicyChangeLog.get_motor_collection().bulk_write(ops, ordered=False)
+    await pol_coll.update_many({"_id": {"$in": pol_ids}}, {"$unset": {"change_history": ""}})
+    logger.info("Migrated change history from %d policy version(s).", len(pol_ids))
+
+
+async def run_migrations() -> None:
+    """Apply every pending data migration."""
+    await migrate_employee_documents()
+    await migrate_policy_change_history()
@@ -15,28 +15,43 @@ async def connect_db() -> None:
     global _client
 
     from app.models.user import User
-    from app.models.employee import Employee
+    from app.models.employee import Employee, EmployeeDocument
     from app.models.leave import LeaveRecord
     from app.models.attendance import Attendance
     from app.models.payroll import Payroll
     from app.models.audit_log import AuditLog
-    from app.models.hr_policy import HRPolicy
+    from app.models.hr_policy import HRPolicy, HRPolicyChangeLog
     from app.cache.query_cache import CachedQuery
     from app.models.update_request import UpdateRequest
     from app.models.appraisal import AppraisalRecord
 
-    _client = AsyncIOMotorClient(settings.MONGODB_URI)
+    _client = AsyncIOMotorClient(
+        settings.MONGODB_URI,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        retryWrites=True,
+        w=1,
+    )
+
+    # Fail fast if the server is unreachable; minPoolSize keeps the pool
+    # topped up in the background from here on
+    await _client.admin.command("ping")
 
     await init_beanie(
         database=_client[settings.MONGODB_DB_NAME],
         document_models=[
             User,
             Employee,
+            EmployeeDocument,
             LeaveRecord,
             Attendance,
             Payroll,
             AuditLog,
             HRPolicy,
+            HRPolicyChangeLog,
             CachedQuery,
             UpdateRequest,
             AppraisalRecord,
@@ -3,18 +3,23 @@ FastAPI application — HRMS Agent backend (Clean Architecture).
 
 Lifespan:
     - Connects to MongoDB via Beanie on startup
+    - Applies pending data migrations
     - Seeds demo data
     - Closes connection on shutdown
 """
 
 from contextlib import asynccontextmanager
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.config import get_settings
+from app.database.migrations import run_migrations
 from app.database.mongodb import connect_db, close_db
 from app.database.seed import seed_database
 from app.middleware.error_handler import ErrorHandlerMiddleware
@@ -25,10 +30,19 @@ from app.routes.chat import router as chat_router
 from app.routes.employees import router as employees_router
 from app.routes.uploads import router as uploads_router
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+# Request handlers only enqueue log records; a background thread owns the
+# blocking write() to stderr.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s")
 )
+_log_listener = QueueListener(_log_queue, _stream_handler)
+_queue_handler = QueueHandler(_log_queue)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+
 logger = logging.getLogger("hrms")
 
 settings = get_settings()
@@ -37,13 +51,19 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
+    # The queue handler is only attached while its listener thread runs
+    _log_listener.start()
+    _root_logger.addHandler(_queue_handler)
     logger.info("Starting HRMS Agent …")
     await connect_db()
+    await run_migrations()
     await seed_database()
     logger.info("HRMS Agent ready.")
     yield
     logger.info("Shutting down HRMS Agent …")
     await close_db()
+    _root_logger.removeHandler(_queue_handler)
+    _log_listener.stop()
 
 
 app = FastAPI(
@@ -51,6 +71,7 @@ app = FastAPI(
     description="AI-powered Human Resource Management System with RBAC, SSO, and chat-driven management.",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ------------------------------------------------------------------
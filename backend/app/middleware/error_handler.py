@@ -10,9 +10,10 @@ import logging
 import traceback
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.config import settings
 from app.exceptions import HRMSException
 
 logger = logging.getLogger("hrms.error")
@@ -27,13 +28,17 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             return response
         except HRMSException as exc:
             logger.warning("HRMS error: %s (status=%d)", exc.message, exc.status_code)
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=exc.status_code,
                 content={"error": exc.message, "status_code": exc.status_code},
             )
         except Exception as exc:
-            logger.error("Unhandled error: %s\n%s", str(exc), traceback.format_exc())
-            return JSONResponse(
+            # Full tracebacks are expensive to format — only in debug mode
+            if settings.DEBUG or logger.isEnabledFor(logging.DEBUG):
+                logger.error("Unhandled error: %s\n%s", exc, traceback.format_exc())
+            else:
+                logger.error("Unhandled error: %s", exc)
+            return ORJSONResponse(
                 status_code=500,
                 content={"error": "Internal server error.", "status_code": 500},
             )
@@ -15,6 +15,10 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     """Log every request with method, path, status, and duration."""
 
     async def dispatch(self, request: Request, call_next):
+        # Access logging disabled — skip the timing work entirely
+        if not logger.isEnabledFor(logging.INFO):
+            return await call_next(request)
+
         start = time.perf_counter()
         response = await call_next(request)
         duration_ms = (time.perf_counter() - start) * 1000
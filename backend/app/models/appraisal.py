@@ -11,9 +11,9 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from pymongo import IndexModel, ASCENDING, DESCENDING
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AppraisalRecord(Document):
@@ -46,19 +46,50 @@ class AppraisalRecord(Document):
     status: str = "initiated"                # initiated | in_review | completed | cancelled
     effective_date: Optional[date] = None    # date from which new salary applies
 
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "appraisals"
         indexes = [
-            IndexModel([("emp_code", ASCENDING)]),
+            # Per-employee history, newest first (also serves emp_code lookups)
+            IndexModel([("emp_code", ASCENDING), ("created_at", DESCENDING)]),
+            # Open-appraisal lookup: emp_code + cycle + status $in [...]
+            IndexModel([("emp_code", ASCENDING), ("appraisal_cycle", ASCENDING), ("status", ASCENDING)]),
+            # At most one live (non-cancelled) appraisal per employee per cycle
+            IndexModel(
+                [("emp_code", ASCENDING), ("appraisal_cycle", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"status": {"$in": ["initiated", "in_review", "completed"]}},
+            ),
             IndexModel([("status", ASCENDING)]),
             IndexModel([("appraisal_cycle", ASCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
         ]
 
 
+class AppraisalHistoryView(BaseModel):
+    """Projection used by appraisal history listings — only returned fields."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    emp_code: str
+    employee_name: str
+    appraisal_cycle: str
+    status: str
+    rating: Optional[float] = None
+    rating_label: Optional[str] = None
+    old_salary: Optional[float] = None
+    new_salary: Optional[float] = None
+    hike_pct: Optional[float] = None
+    old_designation: Optional[str] = None
+    new_designation: Optional[str] = None
+    manager_feedback: Optional[str] = None
+    hr_comments: Optional[str] = None
+    effective_date: Optional[date] = None
+    initiated_by: str
+    created_at: datetime
+
+
 def derive_rating_label(rating: float) -> str:
     """Map numeric rating to descriptive label."""
     if rating >= 4.5:
@@ -6,7 +6,7 @@ from datetime import date
 from typing import Optional
 
 from beanie import Document
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 
 class Attendance(Document):
@@ -21,5 +21,6 @@ class Attendance(Document):
     class Settings:
         name = "attendance"
         indexes = [
-            IndexModel([("emp_code", ASCENDING)]),
+            # Compound index serves emp_code lookups and their sort order
+            IndexModel([("emp_code", ASCENDING), ("date", DESCENDING)]),
         ]
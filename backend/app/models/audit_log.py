@@ -7,6 +7,7 @@ from typing import Any, Optional
 
 from beanie import Document
 from pymongo import IndexModel, ASCENDING
+from pydantic import Field
 
 
 class AuditLog(Document):
@@ -16,7 +17,7 @@ class AuditLog(Document):
     performed_by: str  # user email
     target: Optional[str] = None  # e.g. emp_code affected
     details: Optional[dict[str, Any]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "audit_logs"
@@ -6,8 +6,16 @@ from datetime import date, datetime
 from typing import Optional
 
 from beanie import Document
-from pydantic import BaseModel
-from pymongo import IndexModel, ASCENDING
+from pydantic import BaseModel, Field
+from pymongo import IndexModel, ASCENDING, TEXT
+from pymongo.collation import Collation
+
+from app.models.schemas import EmpCode
+
+
+# Case-insensitive comparison (strength 2 ignores case, not accents). Queries
+# must pass the same collation to use the name / department indexes.
+CASE_INSENSITIVE = Collation(locale="en", strength=2)
 
 
 class Address(BaseModel):
@@ -27,18 +35,10 @@ class EmergencyContact(BaseModel):
     phone: str = ""
 
 
-class UploadedDocument(BaseModel):
-    """Reference to an uploaded file (certificate / ID proof)."""
-    doc_type: str          # e.g. "aadhaar", "pan", "degree", "experience_letter"
-    file_name: str         # original filename
-    file_url: str          # URL path served by backend
-    uploaded_at: datetime = datetime.utcnow()
-
-
 class Employee(Document):
     """Employee profile stored in MongoDB."""
 
-    emp_code: str
+    emp_code: EmpCode
     name: str
     email: str
     department: str
@@ -64,8 +64,8 @@ class Employee(Document):
     # Emergency contact
     emergency_contact: Optional[EmergencyContact] = None
 
-    # ID proofs & certificates (file references)
-    documents: list[UploadedDocument] = []
+    # ID proofs & certificates live in the employee_documents collection
+    # (EmployeeDocument), so profile reads don't carry an unbounded array.
 
     # Employment extras
     pan_number: Optional[str] = None
@@ -78,12 +78,34 @@ class Employee(Document):
     resignation_date: Optional[date] = None
     last_working_date: Optional[date] = None
     exit_reason: Optional[str] = None
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "employees"
         indexes = [
             IndexModel([("emp_code", ASCENDING)], unique=True),
             IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("name", ASCENDING)], collation=CASE_INSENSITIVE),
+            IndexModel([("department", ASCENDING)], collation=CASE_INSENSITIVE),
+            IndexModel(
+                [("name", TEXT), ("department", TEXT), ("designation", TEXT), ("emp_code", TEXT)],
+                name="emp_search_idx",
+            ),
+        ]
+
+
+class EmployeeDocument(Document):
+    """Reference to an uploaded file (certificate / ID proof) for an employee."""
+
+    emp_code: str
+    doc_type: str          # e.g. "aadhaar", "pan", "degree", "experience_letter"
+    file_name: str         # original filename
+    file_url: str          # URL path served by backend
+    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "employee_documents"
+        indexes = [
+            IndexModel([("emp_code", ASCENDING), ("doc_type", ASCENDING)]),
         ]
@@ -9,11 +9,12 @@ tracking.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
 
 from beanie import Document
-from pymongo import IndexModel, ASCENDING
-from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 # ── Salary Breakup Configuration ─────────────────────────
@@ -61,6 +62,70 @@ class TaxSlab(BaseModel):
     rate_pct: float
 
 
+class SlabTable(NamedTuple):
+    """Tax slabs flattened for `bisect` lookup.
+
+    starts[i] is where bracket i begins, rates[i] its marginal rate (as a
+    fraction) and base_tax[i] the tax already due on all income below starts[i].
+    """
+    starts: tuple[float, ...]
+    rates: tuple[float, ...]
+    base_tax: tuple[float, ...]
+
+
+def build_slab_table(slabs: list[TaxSlab]) -> SlabTable:
+    """Precompute bracket starts and cumulative tax for a slab list.
+
+    Slabs are laid end-to-end by width, matching the order they are stored in;
+    income beyond a finite last slab is untaxed.
+    """
+    starts: list[float] = []
+    rates: list[float] = []
+    base_tax: list[float] = []
+    start = tax = 0.0
+    for slab in slabs:
+        upper = slab.max_income if slab.max_income > 0 else float("inf")
+        width = upper - slab.min_income
+        rate = slab.rate_pct / 100
+        starts.append(start)
+        rates.append(rate)
+        base_tax.append(tax)
+        if width == float("inf"):
+            break
+        start += width
+        tax += width * rate
+    else:
+        # Finite last slab: anything above it is not taxed
+        starts.append(start)
+        rates.append(0.0)
+        base_tax.append(tax)
+    return SlabTable(tuple(starts), tuple(rates), tuple(base_tax))
+
+
+class BreakupRatios(NamedTuple):
+    """Salary breakup percentages pre-divided into fractions of the base."""
+    basic: float
+    hra: float
+    pf_employer: float
+    pf_employee: float
+    esi_employer: float
+    esi_employee: float
+    gratuity: float
+
+
+def build_breakup_ratios(b: SalaryBreakup) -> BreakupRatios:
+    """Convert a breakup's percentages into multipliers."""
+    return BreakupRatios(
+        basic=b.basic_pct / 100,
+        hra=b.hra_pct / 100,
+        pf_employer=b.pf_employer_pct / 100,
+        pf_employee=b.pf_employee_pct / 100,
+        esi_employer=b.esi_employer_pct / 100,
+        esi_employee=b.esi_employee_pct / 100,
+        gratuity=b.gratuity_pct / 100,
+    )
+
+
 # ── INITIAL SEED VALUES (used only in seed.py, never at runtime) ──
 
 INITIAL_TAX_SLABS_NEW_REGIME = [
@@ -83,7 +148,7 @@ INITIAL_TAX_SLABS_OLD_REGIME = [
 INITIAL_STATE_PROFESSIONAL_TAX: dict[str, float] = {
     "maharashtra": 200,
     "karnataka": 200,
-    "west bengal": 200,
+    "west_bengal": 200,
     "tamil_nadu": 0,
     "andhra_pradesh": 200,
     "telangana": 200,
@@ -105,6 +170,11 @@ INITIAL_STATE_LEAVE_OVERRIDES: dict[str, dict[str, int]] = {
 }
 
 
+def state_key(state: str) -> str:
+    """Canonical key for the per-state maps, e.g. "Tamil Nadu" → "tamil_nadu"."""
+    return state.strip().lower().replace(" ", "_")
+
+
 # ── Policy Change Log ─────────────────────────────────
 
 class PolicyChangeEntry(BaseModel):
@@ -114,12 +184,26 @@ class PolicyChangeEntry(BaseModel):
     new_value: Optional[str] = None
 
 
-class PolicyChangeLog(BaseModel):
-    """One policy revision record — who changed what and when."""
+class HRPolicyChangeLog(Document):
+    """One policy revision record — who changed what and when.
+
+    Append-only, one document per HRPolicy version, kept out of the policy
+    document itself so the active policy stays small.
+    """
+    policy_version: int
     changed_by: str
-    changed_at: datetime = datetime.utcnow()
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
     reason: Optional[str] = None
-    changes: list[PolicyChangeEntry] = []
+    changes: list[PolicyChangeEntry] = Field(default_factory=list)
+
+    class Settings:
+        name = "hr_policy_changes"
+        indexes = [
+            IndexModel([("policy_version", DESCENDING), ("changed_at", DESCENDING)]),
+        ]
+
+
+ACTIVE_POLICY_INDEX = "active_version"
 
 
 class HRPolicy(Document):
@@ -133,29 +217,86 @@ class HRPolicy(Document):
     policy_name: str = "Default India HR Policy"
     state: str = "maharashtra"
     is_metro: bool = True
-    salary_breakup: SalaryBreakup = SalaryBreakup()
-    leave_policy: LeavePolicy = LeavePolicy()
+    salary_breakup: SalaryBreakup = Field(default_factory=SalaryBreakup)
+    leave_policy: LeavePolicy = Field(default_factory=LeavePolicy)
     tax_regime: str = "new"  # company default
-    tax_slabs: list[TaxSlab] = INITIAL_TAX_SLABS_NEW_REGIME
-    old_regime_tax_slabs: list[TaxSlab] = INITIAL_TAX_SLABS_OLD_REGIME
+    tax_slabs: list[TaxSlab] = Field(default_factory=lambda: list(INITIAL_TAX_SLABS_NEW_REGIME))
+    old_regime_tax_slabs: list[TaxSlab] = Field(default_factory=lambda: list(INITIAL_TAX_SLABS_OLD_REGIME))
     standard_deduction: float = 75000.0
     old_regime_standard_deduction: float = 50000.0
     cess_pct: float = 4.0
 
     # ── State-level reference data (stored in DB, fully editable) ──
-    state_professional_tax: dict[str, float] = INITIAL_STATE_PROFESSIONAL_TAX
-    state_leave_overrides: dict[str, dict[str, int]] = INITIAL_STATE_LEAVE_OVERRIDES
+    state_professional_tax: dict[str, float] = Field(default_factory=lambda: dict(INITIAL_STATE_PROFESSIONAL_TAX))
+    state_leave_overrides: dict[str, dict[str, int]] = Field(
+        default_factory=lambda: {k: dict(v) for k, v in INITIAL_STATE_LEAVE_OVERRIDES.items()}
+    )
 
     is_active: bool = True
-    change_history: list[PolicyChangeLog] = []
     version: int = 1
     created_by: Optional[str] = None
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Derived lookup tables, built lazily (the active policy is cached)
+    _slab_tables: dict[str, SlabTable] = PrivateAttr(default_factory=dict)
+    _ratios: Optional[BreakupRatios] = PrivateAttr(default=None)
+    _state_pt: Optional[Mapping[str, float]] = PrivateAttr(default=None)
+    _state_leave: Optional[Mapping[str, dict[str, int]]] = PrivateAttr(default=None)
+
+    def slab_table(self, regime: str) -> SlabTable:
+        """Return the bisect lookup table for the given tax regime's slabs."""
+        table = self._slab_tables.get(regime)
+        if table is None:
+            slabs = self.old_regime_tax_slabs if regime == "old" else self.tax_slabs
+            table = self._slab_tables[regime] = build_slab_table(slabs)
+        return table
+
+    def breakup_ratios(self) -> BreakupRatios:
+        """Return the salary breakup percentages as multipliers."""
+        if self._ratios is None:
+            self._ratios = build_breakup_ratios(self.salary_breakup)
+        return self._ratios
+
+    def state_pt_map(self) -> Mapping[str, float]:
+        """Read-only state → professional tax map with canonical keys."""
+        if self._state_pt is None:
+            self._state_pt = MappingProxyType(
+                {state_key(k): v for k, v in (self.state_professional_tax or {}).items()}
+            )
+        return self._state_pt
+
+    def state_leave_map(self) -> Mapping[str, dict[str, int]]:
+        """Read-only state → leave overrides map with canonical keys."""
+        if self._state_leave is None:
+            self._state_leave = MappingProxyType(
+                {state_key(k): v for k, v in (self.state_leave_overrides or {}).items()}
+            )
+        return self._state_leave
 
     class Settings:
         name = "hr_policies"
         indexes = [
-            IndexModel([("is_active", ASCENDING)]),
+            # Active-policy lookup: one seek, newest version first
+            IndexModel([("is_active", ASCENDING), ("version", DESCENDING)], name=ACTIVE_POLICY_INDEX),
             IndexModel([("version", ASCENDING)]),
         ]
+
+
+class PolicyHistorySummary(BaseModel):
+    """Projection for policy history listings — skips the state reference maps."""
+
+    version: int
+    policy_name: str
+    state: str
+    is_active: bool
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    salary_breakup: SalaryBreakup
+    leave_policy: LeavePolicy
+    tax_regime: str
+    tax_slabs: list[TaxSlab]
+    old_regime_tax_slabs: list[TaxSlab]
+    standard_deduction: float
+    old_regime_standard_deduction: float
+    cess_pct: float
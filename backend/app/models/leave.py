@@ -7,6 +7,7 @@ from typing import Optional
 
 from beanie import Document
 from pymongo import IndexModel, ASCENDING
+from pydantic import Field
 
 
 class LeaveRecord(Document):
@@ -19,11 +20,12 @@ class LeaveRecord(Document):
     status: str = "pending"  # pending, approved, rejected, credit
     reason: Optional[str] = None
     approved_by: Optional[str] = None
-    applied_on: datetime = datetime.utcnow()
+    applied_on: datetime = Field(default_factory=datetime.utcnow)
     days_credited: Optional[int] = None  # for leave credit records
 
     class Settings:
         name = "leave_records"
         indexes = [
-            IndexModel([("emp_code", ASCENDING)]),
+            # Serves emp_code lookups, optionally narrowed by status / start_date
+            IndexModel([("emp_code", ASCENDING), ("status", ASCENDING), ("start_date", ASCENDING)]),
         ]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from beanie import Document
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 
 class Payroll(Document):
@@ -20,5 +20,6 @@ class Payroll(Document):
     class Settings:
         name = "payroll"
         indexes = [
-            IndexModel([("emp_code", ASCENDING)]),
+            # Compound index serves emp_code lookups and their sort order
+            IndexModel([("emp_code", ASCENDING), ("month", DESCENDING)]),
         ]
@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import AfterValidator, BaseModel, EmailStr
+
+
+# ── Shared field types ──
+
+# Employee codes are stored upper-case; normalise once at the API boundary so
+# repositories can query with the value as given.
+EmpCode = Annotated[str, AfterValidator(lambda v: v.strip().upper())]
 
 
 # ── Chat ──
@@ -85,5 +92,6 @@ class PayrollResponse(BaseModel):
     month: str
     basic: float
     hra: float
+    allowances: float = 0.0
     deductions: float
     net_pay: float
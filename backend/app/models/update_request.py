@@ -12,7 +12,7 @@ from typing import Optional
 
 from beanie import Document
 from pymongo import IndexModel, ASCENDING, DESCENDING
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FieldChange(BaseModel):
@@ -25,21 +25,22 @@ class FieldChange(BaseModel):
 class UpdateRequest(Document):
     """Employee-initiated profile update request."""
 
-    emp_code: str
-    employee_name: str             # denormalized for convenience
+    emp_code: str                  # employee name is joined from employees at read time
     requested_fields: list[FieldChange]
     reason: str                    # why the employee wants this change
     status: str = "pending"        # pending | approved | rejected
     reviewed_by: Optional[str] = None   # email of HR/manager who reviewed
     review_comment: Optional[str] = None
     reviewed_at: Optional[datetime] = None
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "update_requests"
         indexes = [
             IndexModel([("emp_code", ASCENDING)]),
-            IndexModel([("status", ASCENDING)]),
+            # Listing by status (and optionally employee), newest first; the
+            # status prefix also serves status-only filters
+            IndexModel([("status", ASCENDING), ("emp_code", ASCENDING), ("created_at", DESCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
         ]
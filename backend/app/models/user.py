@@ -8,7 +8,7 @@ from typing import Optional
 
 from beanie import Document
 from pymongo import IndexModel, ASCENDING
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserRole(str, Enum):
@@ -18,11 +18,20 @@ class UserRole(str, Enum):
     EMPLOYEE = "employee"
 
 
+def _compile_masks(
+    role_map: dict[UserRole, frozenset[str]],
+) -> tuple[dict[str, int], dict[UserRole, int]]:
+    """Assign each permission a bit and fold every role into an int mask."""
+    bits = {p: 1 << i for i, p in enumerate(sorted(set().union(*role_map.values())))}
+    masks = {role: sum(bits[p] for p in perms) for role, perms in role_map.items()}
+    return bits, masks
+
+
 class RolePermissions:
     """Centralized permission map — single source of truth."""
 
-    _MAP: dict[UserRole, set[str]] = {
-        UserRole.SUPER_ADMIN: {
+    _MAP: dict[UserRole, frozenset[str]] = {
+        UserRole.SUPER_ADMIN: frozenset({
             "view_employee",
             "view_leave",
             "apply_leave",
@@ -33,8 +42,8 @@ class RolePermissions:
             "manage_roles",
             "view_own_data",
             "view_all_data",
-        },
-        UserRole.HR_ADMIN: {
+        }),
+        UserRole.HR_ADMIN: frozenset({
             "view_employee",
             "view_leave",
             "apply_leave",
@@ -44,8 +53,8 @@ class RolePermissions:
             "manage_employee",
             "view_own_data",
             "view_all_data",
-        },
-        UserRole.MANAGER: {
+        }),
+        UserRole.MANAGER: frozenset({
             "view_employee",
             "view_leave",
             "apply_leave",
@@ -53,24 +62,37 @@ class RolePermissions:
             "view_payroll",
             "view_attendance",
             "view_own_data",
-        },
-        UserRole.EMPLOYEE: {
+        }),
+        UserRole.EMPLOYEE: frozenset({
             "view_employee",
             "view_leave",
             "apply_leave",
             "view_attendance",
             "view_payroll",
             "view_own_data",
-        },
+        }),
     }
+    _EMPTY: frozenset[str] = frozenset()
+
+    # _MAP compiled to bitmasks at import; checks are a single integer AND.
+    # UserRole mixes in str ahead of Enum, so keys hash/compare with str's C
+    # implementation (cached hash) — a plain dict is the cheapest role lookup.
+    _BITS, _MASKS = _compile_masks(_MAP)
 
     @classmethod
     def has_permission(cls, role: UserRole, permission: str) -> bool:
-        return permission in cls._MAP.get(role, set())
+        return bool(cls._MASKS.get(role, 0) & cls._BITS.get(permission, 0))
 
     @classmethod
-    def get_permissions(cls, role: UserRole) -> set[str]:
-        return cls._MAP.get(role, set())
+    def has_any_permission(cls, role: UserRole, *permissions: str) -> bool:
+        wanted = 0
+        for p in permissions:
+            wanted |= cls._BITS.get(p, 0)
+        return bool(cls._MASKS.get(role, 0) & wanted)
+
+    @classmethod
+    def get_permissions(cls, role: UserRole) -> frozenset[str]:
+        return cls._MAP.get(role, cls._EMPTY)
 
 
 class SSOProfile(BaseModel):
@@ -91,9 +113,9 @@ class User(Document):
     role: UserRole = UserRole.EMPLOYEE
     emp_code: Optional[str] = None  # Link to Employee document
     is_active: bool = True
-    sso_profiles: list[SSOProfile] = []
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    sso_profiles: list[SSOProfile] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "users"
@@ -101,5 +123,13 @@ class User(Document):
             IndexModel([("email", ASCENDING)], unique=True),
         ]
 
+    @property
+    def perms(self) -> frozenset[str]:
+        """Permissions granted by this user's role (shared, precomputed set)."""
+        return RolePermissions.get_permissions(self.role)
+
     def has_permission(self, permission: str) -> bool:
         return RolePermissions.has_permission(self.role, permission)
+
+    def has_any_permission(self, *permissions: str) -> bool:
+        return RolePermissions.has_any_permission(self.role, *permissions)
@@ -6,6 +6,7 @@ from datetime import date
 from typing import Optional
 
 from app.models.attendance import Attendance
+from app.models.schemas import AttendanceResponse
 from app.repositories.base import BaseRepository
 
 
@@ -15,14 +16,15 @@ class AttendanceRepository(BaseRepository[Attendance]):
         super().__init__(Attendance)
 
     async def find_by_emp_code(
-        self, emp_code: str, target_date: Optional[str] = None, limit: int = 10
-    ) -> list[Attendance]:
-        filters: dict = {"emp_code": emp_code.upper()}
+        self, emp_code: str, target_date: Optional[date] = None, limit: int = 10
+    ) -> list[AttendanceResponse]:
+        filters: dict = {"emp_code": emp_code}
         if target_date:
-            filters["date"] = date.fromisoformat(target_date)
+            filters["date"] = target_date
         return await (
             Attendance.find(filters)
             .sort("-date")
             .limit(limit)
+            .project(AttendanceResponse)
             .to_list()
         )
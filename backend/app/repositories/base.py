@@ -2,13 +2,29 @@
 
 from __future__ import annotations
 
-from typing import Any, Generic, Optional, Type, TypeVar
+from datetime import datetime
+from typing import Any, Generic, Iterable, Optional, Type, TypeVar
 
 from beanie import Document
 
 T = TypeVar("T", bound=Document)
 
 
+def restore_dates(rows: list[dict], date_fields: Iterable[str]) -> list[dict]:
+    """Render the datetimes of raw rows as ``model_dump(mode="json")`` would.
+
+    BSON has no date type, so date-only *date_fields* come back as midnight
+    datetimes and are output as ``YYYY-MM-DD``; every other top-level
+    datetime becomes a full ISO timestamp.
+    """
+    date_fields = frozenset(date_fields)
+    for row in rows:
+        for field, value in row.items():
+            if isinstance(value, datetime):
+                row[field] = (value.date() if field in date_fields else value).isoformat()
+    return rows
+
+
 class BaseRepository(Generic[T]):
     """Generic async repository with common CRUD."""
 
@@ -33,6 +49,11 @@ class BaseRepository(Generic[T]):
         await doc.save()
         return doc
 
+    async def set_fields(self, doc: T, changes: dict[str, Any]) -> T:
+        """``$set`` only the given fields instead of re-sending the whole document."""
+        await doc.set(changes)
+        return doc
+
     async def delete(self, doc: T) -> None:
         await doc.delete()
 
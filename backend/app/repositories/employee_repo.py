@@ -3,11 +3,31 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from app.models.employee import Employee
-from app.repositories.base import BaseRepository
+from beanie import UpdateResponse
+
+from app.models.employee import CASE_INSENSITIVE, Employee
+from app.models.schemas import EmployeeResponse
+from app.repositories.base import BaseRepository, restore_dates
+
+# Search terms that look like an employee code (e.g. "EMP01") are matched on
+# emp_code (exact or anchored prefix, both served by its B-tree index);
+# anything else is treated as a name. Bare digits are not a code prefix.
+_EMP_CODE_PREFIX = re.compile(r"^[A-Za-z]+\d+$")
+
+# Listings only need the EmployeeResponse fields — let Mongo drop the rest
+# (addresses, documents, ID numbers, …) before they hit the wire.
+_LIST_PROJECTION = {"_id": 0, **{f: 1 for f in EmployeeResponse.model_fields}}
+
+# Full profile minus storage internals, for raw department listings. An
+# inclusion list, so stale keys left on old documents never leak through
+_DEPT_PROJECTION = {
+    "_id": 0,
+    **{f: 1 for f in Employee.model_fields if f not in ("id", "revision_id")},
+}
+_DATE_FIELDS = ("date_of_joining", "date_of_birth", "resignation_date", "last_working_date")
 
 
 class EmployeeRepository(BaseRepository[Employee]):
@@ -16,83 +36,142 @@ class EmployeeRepository(BaseRepository[Employee]):
         super().__init__(Employee)
 
     async def find_by_emp_code(self, emp_code: str) -> Optional[Employee]:
-        return await Employee.find_one(Employee.emp_code == emp_code.upper())
+        """*emp_code* must already be upper-case (normalised at the API edge)."""
+        return await Employee.find_one(Employee.emp_code == emp_code)
+
+    async def find_tax_regimes(self, emp_codes: list[str]) -> dict[str, str]:
+        """Map emp_code → chosen tax regime for many employees in one query."""
+        rows = await Employee.get_motor_collection().find(
+            {"emp_code": {"$in": emp_codes}}, {"_id": 0, "emp_code": 1, "tax_regime": 1}
+        ).to_list(length=None)
+        return {r["emp_code"]: r.get("tax_regime", "new") for r in rows}
 
     async def find_by_name(self, name: str) -> Optional[Employee]:
-        pattern = re.compile(re.escape(name), re.IGNORECASE)
-        return await Employee.find_one({"name": {"$regex": pattern}})
+        """Exact (case-insensitive) name, then substring match.
 
-    async def find_by_query(self, query: str) -> Optional[Employee]:
-        """Look up by emp_code first, then by name."""
-        emp = await self.find_by_emp_code(query)
-        if not emp:
-            emp = await self.find_by_name(query)
-        return emp
+        The common full-name lookup is served by the collated ``name`` index;
+        the regex scan only runs when that misses, so a miss costs two queries.
+        """
+        emp = await Employee.find_one({"name": name}, collation=CASE_INSENSITIVE)
+        if emp:
+            return emp
+        return await Employee.find_one({"name": {"$regex": re.escape(name), "$options": "i"}})
 
-    async def list_by_department(self, department: str) -> list[Employee]:
-        pattern = re.compile(re.escape(department), re.IGNORECASE)
-        return await Employee.find({"department": {"$regex": pattern}}).to_list()
+    async def find_by_query(self, query: str) -> Optional[Employee]:
+        """Look up by emp_code, then by name.
 
-    async def list_active(self) -> list[Employee]:
-        return await Employee.find(Employee.status == "active").to_list()
+        Any emp_code shape is accepted, so the code lookup always runs first —
+        a single read on the unique index.
+        """
+        query = query.strip()
+        emp = await self.find_by_emp_code(query.upper())
+        if emp:
+            return emp
+        return await self.find_by_name(query)
+
+    async def list_by_department(self, department: str) -> list[dict]:
+        """Exact (case-insensitive) department, falling back to substring.
+
+        Department names are a small fixed set, so the exact match via the
+        collated ``department`` index covers nearly every call. Rows come back
+        as plain dicts (no model hydration), ready to serialise.
+        """
+        coll = Employee.get_motor_collection()
+        rows = await coll.find(
+            {"department": department}, _DEPT_PROJECTION, collation=CASE_INSENSITIVE
+        ).to_list(length=None)
+        if not rows:
+            rows = await coll.find(
+                {"department": {"$regex": re.escape(department), "$options": "i"}},
+                _DEPT_PROJECTION,
+            ).to_list(length=None)
+        return restore_dates(rows, _DATE_FIELDS)
+
+    async def list_active(self) -> list[EmployeeResponse]:
+        return await (
+            Employee.find(Employee.status == "active")
+            .project(EmployeeResponse)
+            .to_list()
+        )
 
     async def list_paginated(
         self,
         page: int = 1,
         page_size: int = 10,
         search: str | None = None,
-    ) -> tuple[list[Employee], int]:
-        """Return a page of active employees + total count.
+    ) -> tuple[list[EmployeeResponse], int]:
+        """Return a page of active employees (listing fields only) + total count.
 
-        *search* filters across name, emp_code, department, designation
-        (case-insensitive partial match).
+        *search* matches whole words of name, department, designation or
+        emp_code via the ``emp_search_idx`` text index; code-like terms
+        ("EMP01") match as an emp_code prefix and bare digits ("01") as an
+        emp_code substring instead.
         """
         query: dict = {"status": "active"}
         if search:
-            pattern = re.compile(re.escape(search), re.IGNORECASE)
-            query["$or"] = [
-                {"name": {"$regex": pattern}},
-                {"emp_code": {"$regex": pattern}},
-                {"department": {"$regex": pattern}},
-                {"designation": {"$regex": pattern}},
-            ]
-        total = await Employee.find(query).count()
+            search = search.strip()
+            if _EMP_CODE_PREFIX.match(search):
+                query["emp_code"] = {"$regex": f"^{re.escape(search.upper())}"}
+            elif search.isdigit():
+                query["emp_code"] = {"$regex": search}
+            else:
+                query["$text"] = {"$search": search}
         skip = (page - 1) * page_size
-        employees = (
-            await Employee.find(query)
-            .sort("+emp_code")
-            .skip(skip)
-            .limit(page_size)
-            .to_list()
-        )
-        return employees, total
-
-    async def get_all_departments(self) -> dict[str, int]:
-        """Department breakdown with counts."""
+        # One round trip: filter once, then page + count in a $facet
         pipeline = [
-            {"$match": {"status": "active"}},
-            {"$group": {"_id": "$department", "count": {"$sum": 1}}},
+            {"$match": query},
+            {"$facet": {
+                "data": [
+                    {"$sort": {"emp_code": 1}},
+                    {"$skip": skip},
+                    {"$limit": page_size},
+                    {"$project": _LIST_PROJECTION},
+                ],
+                "total": [{"$count": "n"}],
+            }},
         ]
         results = await Employee.aggregate(pipeline).to_list()
-        return {r["_id"]: r["count"] for r in results}
+        facet = results[0] if results else {"data": [], "total": []}
+        employees = [EmployeeResponse.model_validate(doc) for doc in facet["data"]]
+        total = facet["total"][0]["n"] if facet["total"] else 0
+        return employees, total
+
+    async def get_active_stats(self) -> tuple[int, dict[str, int], float]:
+        """Active headcount, per-department counts and average salary.
 
-    async def get_average_salary(self) -> float:
+        One ``$group`` pass per department; the totals are folded here.
+        """
         pipeline = [
             {"$match": {"status": "active"}},
-            {"$group": {"_id": None, "avg": {"$avg": "$salary"}}},
+            {"$group": {
+                "_id": "$department",
+                "count": {"$sum": 1},
+                "salary": {"$sum": "$salary"},
+            }},
         ]
         results = await Employee.aggregate(pipeline).to_list()
-        return round(results[0]["avg"], 2) if results else 0.0
+        departments = {r["_id"]: r["count"] for r in results}
+        total = sum(departments.values())
+        avg_salary = round(sum(r["salary"] for r in results) / total, 2) if total else 0.0
+        return total, departments, avg_salary
+
+    async def set_by_emp_code(self, emp_code: str, changes: dict) -> bool:
+        """``$set`` *changes* on one employee without loading it; True if found."""
+        result = await Employee.find_one(Employee.emp_code == emp_code).update(
+            {"$set": changes}
+        )
+        return result.matched_count > 0
 
     async def initiate_resignation(
-        self, emp_code: str, resignation_date: str, exit_reason: str
+        self, emp_code: str, resignation_date: date, exit_reason: str
     ) -> Optional[Employee]:
-        emp = await self.find_by_emp_code(emp_code)
-        if not emp:
-            return None
-        emp.status = "resigned"
-        emp.resignation_date = datetime.strptime(resignation_date, "%Y-%m-%d").date()
-        emp.exit_reason = exit_reason
-        emp.updated_at = datetime.utcnow()
-        await emp.save()
-        return emp
+        # Single atomic find_one_and_update instead of read + save
+        return await Employee.find_one(Employee.emp_code == emp_code).update(
+            {"$set": {
+                "status": "resigned",
+                "resignation_date": resignation_date,
+                "exit_reason": exit_reason,
+                "updated_at": datetime.utcnow(),
+            }},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
 from typing import Optional
 
+from beanie.odm.utils.dump import get_dict
+from bson import ObjectId
+
 from app.models.leave import LeaveRecord
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, restore_dates
+
+# Full record minus storage internals, for raw listings
+_LIST_PROJECTION = {
+    "_id": 0,
+    **{f: 1 for f in LeaveRecord.model_fields if f not in ("id", "revision_id")},
+}
+_DATE_FIELDS = ("start_date", "end_date")
 
 
 class LeaveRepository(BaseRepository[LeaveRecord]):
@@ -16,43 +26,49 @@ class LeaveRepository(BaseRepository[LeaveRecord]):
 
     async def find_by_emp_code(
         self, emp_code: str, status: Optional[str] = None
-    ) -> list[LeaveRecord]:
-        filters: dict = {"emp_code": emp_code.upper()}
+    ) -> list[dict]:
+        """Raw leave rows — read-only, so skip document hydration."""
+        filters: dict = {"emp_code": emp_code}
         if status:
             filters["status"] = status.lower()
-        return await LeaveRecord.find(filters).to_list()
+        rows = await LeaveRecord.get_motor_collection().find(
+            filters, _LIST_PROJECTION
+        ).to_list(length=None)
+        return restore_dates(rows, _DATE_FIELDS)
 
     async def apply_leave(
         self,
         emp_code: str,
         leave_type: str,
-        start_date: str,
-        end_date: str,
+        start_date: date,
+        end_date: date,
         reason: str,
-    ) -> LeaveRecord:
-        record = LeaveRecord(
-            emp_code=emp_code.upper(),
+    ) -> ObjectId:
+        """Insert a pending leave and return its ``_id``.
+
+        Callers only need the acknowledgement, so the record is built without
+        validation and encoded by Beanie straight into a raw insert.
+        """
+        doc = LeaveRecord.model_construct(
+            emp_code=emp_code,
             leave_type=leave_type.lower(),
-            start_date=date.fromisoformat(start_date),
-            end_date=date.fromisoformat(end_date),
-            status="pending",
+            start_date=start_date,
+            end_date=end_date,
             reason=reason,
-            applied_on=datetime.utcnow(),
         )
-        await record.insert()
-        return record
+        result = await LeaveRecord.get_motor_collection().insert_one(get_dict(doc, to_db=True))
+        return result.inserted_id
 
     async def update_status(
-        self, emp_code: str, start_date: str, new_status: str, approved_by: str
-    ) -> Optional[LeaveRecord]:
-        """Approve or reject a pending leave."""
-        record = await LeaveRecord.find_one(
-            LeaveRecord.emp_code == emp_code.upper(),
-            LeaveRecord.start_date == date.fromisoformat(start_date),
+        self, emp_code: str, start_date: date, new_status: str, approved_by: str
+    ) -> bool:
+        """Approve or reject a pending leave; True if one was found.
+
+        A plain update_one — the updated record is not fetched back.
+        """
+        result = await LeaveRecord.find_one(
+            LeaveRecord.emp_code == emp_code,
+            LeaveRecord.start_date == start_date,
             LeaveRecord.status == "pending",
-        )
-        if record:
-            record.status = new_status.lower()
-            record.approved_by = approved_by
-            await record.save()
-        return record
+        ).update({"$set": {"status": new_status.lower(), "approved_by": approved_by}})
+        return result.matched_count > 0
@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from app.models.payroll import Payroll
+from app.models.schemas import PayrollResponse
 from app.repositories.base import BaseRepository
 
+# Stream exactly the slip fields get_slip returns, whatever else is stored
+_SLIP_PROJECTION = {"_id": 0, **{f: 1 for f in PayrollResponse.model_fields}}
+
 
 class PayrollRepository(BaseRepository[Payroll]):
 
     def __init__(self):
         super().__init__(Payroll)
 
-    async def find_by_emp_and_month(self, emp_code: str, month: str) -> Optional[Payroll]:
+    async def find_by_emp_and_month(self, emp_code: str, month: str) -> Optional[PayrollResponse]:
         return await Payroll.find_one(
-            Payroll.emp_code == emp_code.upper(),
+            Payroll.emp_code == emp_code,
             Payroll.month == month,
+            projection_model=PayrollResponse,
         )
 
-    async def find_all_by_emp(self, emp_code: str) -> list[Payroll]:
+    async def find_all_by_emp(self, emp_code: str) -> list[PayrollResponse]:
         return await Payroll.find(
-            Payroll.emp_code == emp_code.upper(),
-        ).sort("-month").to_list()
+            Payroll.emp_code == emp_code,
+        ).sort("-month").project(PayrollResponse).to_list()
+
+    async def iter_by_emp(self, emp_code: str) -> AsyncIterator[dict]:
+        """Yield raw slip rows, newest first, straight off the cursor."""
+        cursor = Payroll.get_motor_collection().find(
+            {"emp_code": emp_code}, _SLIP_PROJECTION
+        ).sort("month", -1)
+        async for row in cursor:
+            yield row
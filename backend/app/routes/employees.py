@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.auth.dependencies import get_current_user
-from app.models.user import User, RolePermissions
+from app.models.schemas import EmpCode
+from app.models.user import User
 from app.services.employee_service import EmployeeService
 from app.services.hr_policy_service import HRPolicyService
+from app.services.payroll_service import PayrollService
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 _svc = EmployeeService()
 _hr_svc = HRPolicyService()
+_pay_svc = PayrollService()
 
 
 class SalaryPreviewRequest(BaseModel):
@@ -21,7 +25,8 @@ class SalaryPreviewRequest(BaseModel):
 
 @router.get("/")
 async def list_employees(user: User = Depends(get_current_user)):
-    return await _svc.list_all()
+    # Already-serialised JSON; skip FastAPI's jsonable_encoder pass
+    return Response(content=await _svc.list_all(), media_type="application/json")
 
 
 @router.post("/salary-preview")
@@ -30,7 +35,23 @@ async def salary_preview(
     user: User = Depends(get_current_user),
 ):
     """Compute salary breakup from annual CTC using active HR policy."""
-    perms = RolePermissions.get_permissions(user.role)
-    if "view_payroll" not in perms and "manage_employee" not in perms:
+    if not user.has_any_permission("view_payroll", "manage_employee"):
         return {"error": "Access denied. You need view_payroll or manage_employee permission."}
     return await _hr_svc.compute_salary_breakup(body.annual_ctc)
+
+
+@router.get("/{emp_code}/payroll")
+async def payroll_history(
+    emp_code: EmpCode,
+    pretty: bool = False,
+    user: User = Depends(get_current_user),
+):
+    """Stream an employee's full payroll history as a JSON array.
+
+    Output is compact; pass ``?pretty=1`` for indented rows.
+    """
+    if not user.has_permission("view_payroll"):
+        return {"error": "Access denied. You need view_payroll permission."}
+    if emp_code != user.emp_code and not user.has_permission("view_all_data"):
+        return {"error": "Access denied. You can only view your own payroll."}
+    return StreamingResponse(_pay_svc.iter_slips(emp_code, pretty), media_type="application/json")
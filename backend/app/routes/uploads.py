@@ -5,11 +5,18 @@ from __future__ import annotations
 import os
 import uuid
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, File, UploadFile, Form
+import aiofiles
+import aiofiles.os
+import aiofiles.tempfile
+from fastapi import APIRouter, Depends, File, UploadFile, Form, Response
 
 from app.auth.dependencies import get_current_user
-from app.models.employee import Employee, UploadedDocument
+from app.config import settings
+from app.models.employee import EmployeeDocument
+from app.models.schemas import EmpCode
 from app.models.user import User
 from app.repositories.employee_repo import EmployeeRepository
 
@@ -17,92 +24,131 @@ router = APIRouter(prefix="/api/uploads", tags=["uploads"])
 
 UPLOAD_DIR = "/app/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+_UPLOAD_ROOT = Path(UPLOAD_DIR).resolve()
+
+# Upload copy buffer — bounds memory per request regardless of file size,
+# large enough to keep write() syscalls few on big documents
+_CHUNK_SIZE = 1 << 20
 
 _emp_repo = EmployeeRepository()
 
+# Fields returned to clients for a document reference
+_DOC_FIELDS = {"doc_type", "file_name", "file_url", "uploaded_at"}
+
 
 @router.post("/{emp_code}/document")
 async def upload_document(
-    emp_code: str,
+    emp_code: EmpCode,
     doc_type: str = Form(..., description="Document type: aadhaar, pan, degree, experience_letter, offer_letter, passport, voter_id, other"),
     file: UploadFile = File(...),
     user: User = Depends(get_current_user),
 ):
     """Upload a document (certificate / ID proof) for an employee."""
-    emp = await _emp_repo.find_by_emp_code(emp_code.upper())
-    if not emp:
+    if not await _emp_repo.count({"emp_code": emp_code}):
         return {"error": f"Employee {emp_code} not found."}
 
     # Generate unique filename
     ext = os.path.splitext(file.filename or "file")[1] or ".pdf"
-    unique_name = f"{emp_code.upper()}_{doc_type}_{uuid.uuid4().hex[:8]}{ext}"
+    unique_name = f"{emp_code}_{doc_type}_{uuid.uuid4().hex[:8]}{ext}"
     file_path = os.path.join(UPLOAD_DIR, unique_name)
 
-    # Save file
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Stream into a hidden staging file and rename it into place once complete,
+    # so a partial upload never appears under its public name
+    tmp_path = None
+    try:
+        async with aiofiles.tempfile.NamedTemporaryFile(
+            "wb", dir=UPLOAD_DIR, prefix=".upload-", delete=False, buffering=_CHUNK_SIZE
+        ) as tmp:
+            tmp_path = tmp.name
+            while chunk := await file.read(_CHUNK_SIZE):
+                await tmp.write(chunk)
+        # mkstemp creates 0600; uploads must stay readable by a fronting nginx
+        os.chmod(tmp_path, 0o644)
+        await aiofiles.os.replace(tmp_path, file_path)
+    except Exception:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     # Create document reference
-    doc_ref = UploadedDocument(
+    doc_ref = EmployeeDocument(
+        emp_code=emp_code,
         doc_type=doc_type,
         file_name=file.filename or unique_name,
         file_url=f"/api/uploads/files/{unique_name}",
         uploaded_at=datetime.utcnow(),
     )
-    emp.documents.append(doc_ref)
-    emp.updated_at = datetime.utcnow()
-    await _emp_repo.update(emp)
+    await doc_ref.insert()
 
     return {
         "success": True,
         "message": f"Document '{doc_type}' uploaded for {emp_code}.",
-        "document": doc_ref.model_dump(mode="json"),
+        "document": doc_ref.model_dump(mode="json", include=_DOC_FIELDS),
     }
 
 
 @router.get("/files/{filename}")
 async def serve_file(filename: str):
     """Serve an uploaded file."""
+    file_path = (_UPLOAD_ROOT / filename).resolve()
+    # Reject anything that escapes the upload directory ("..", symlinks), and
+    # hidden names — in-flight uploads are staged as ".upload-*" files there
+    if file_path.parent != _UPLOAD_ROOT or file_path.name.startswith("."):
+        return {"error": "File not found."}
+
+    if settings.UPLOADS_ACCEL_REDIRECT_PREFIX:
+        # Behind nginx: hand the transfer to its internal location (sendfile)
+        return Response(headers={
+            "X-Accel-Redirect": settings.UPLOADS_ACCEL_REDIRECT_PREFIX + quote(file_path.name),
+        })
+
     from fastapi.responses import FileResponse
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    if not os.path.exists(file_path):
+    try:
+        stat_result = file_path.stat()
+    except OSError:
         return {"error": "File not found."}
-    return FileResponse(file_path)
+    # Hand over the stat we already did so FileResponse doesn't repeat it
+    return FileResponse(file_path, stat_result=stat_result)
 
 
 @router.get("/{emp_code}/documents")
 async def list_documents(
-    emp_code: str,
+    emp_code: EmpCode,
     user: User = Depends(get_current_user),
 ):
     """List all uploaded documents for an employee."""
-    emp = await _emp_repo.find_by_emp_code(emp_code.upper())
-    if not emp:
+    docs = await EmployeeDocument.find(EmployeeDocument.emp_code == emp_code).to_list()
+    # Only an empty result needs the employee existence check
+    if not docs and not await _emp_repo.count({"emp_code": emp_code}):
         return {"error": f"Employee {emp_code} not found."}
     return {
-        "emp_code": emp.emp_code,
-        "documents": [d.model_dump(mode="json") for d in emp.documents],
+        "emp_code": emp_code,
+        "documents": [d.model_dump(mode="json", include=_DOC_FIELDS) for d in docs],
     }
 
 
 @router.delete("/{emp_code}/document/{doc_type}")
 async def delete_document(
-    emp_code: str,
+    emp_code: EmpCode,
     doc_type: str,
     user: User = Depends(get_current_user),
 ):
     """Delete a document of a specific type for an employee."""
-    emp = await _emp_repo.find_by_emp_code(emp_code.upper())
-    if not emp:
-        return {"error": f"Employee {emp_code} not found."}
-
-    original_count = len(emp.documents)
-    emp.documents = [d for d in emp.documents if d.doc_type != doc_type]
-
-    if len(emp.documents) == original_count:
+    coll = EmployeeDocument.get_motor_collection()
+    query = {"emp_code": emp_code, "doc_type": doc_type}
+    docs = await coll.find(query, {"file_url": 1}).to_list(length=None)
+    if not docs:
+        # Nothing to delete — work out which error to report
+        if not await _emp_repo.count({"emp_code": emp_code}):
+            return {"error": f"Employee {emp_code} not found."}
         return {"error": f"No document of type '{doc_type}' found for {emp_code}."}
 
-    emp.updated_at = datetime.utcnow()
-    await _emp_repo.update(emp)
+    await coll.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+    # Best-effort removal of the stored files; the references are already gone
+    for d in docs:
+        try:
+            await aiofiles.os.remove(_UPLOAD_ROOT / d["file_url"].rsplit("/", 1)[-1])
+        except OSError:
+            pass
+
     return {"success": True, "message": f"Document '{doc_type}' removed for {emp_code}."}
@@ -11,10 +11,16 @@ Workflow:
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime
 from typing import Optional
 
-from app.models.appraisal import AppraisalRecord, derive_rating_label
+from beanie.operators import In
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models.appraisal import AppraisalHistoryView, AppraisalRecord, derive_rating_label
 from app.models.employee import Employee
 from app.repositories.employee_repo import EmployeeRepository
 from app.services.hr_policy_service import HRPolicyService
@@ -37,23 +43,16 @@ class AppraisalService:
         manager_feedback: Optional[str] = None,
     ) -> dict:
         """Start an appraisal for an employee in a given cycle."""
-        emp = await self._emp_repo.find_by_emp_code(emp_code.upper())
+        emp = await self._emp_repo.find_by_emp_code(emp_code)
         if not emp:
             return {"error": f"Employee {emp_code} not found."}
 
-        # Check for duplicate in same cycle
-        existing = await AppraisalRecord.find_one(
-            AppraisalRecord.emp_code == emp_code.upper(),
-            AppraisalRecord.appraisal_cycle == appraisal_cycle,
-            AppraisalRecord.status != "cancelled",
-        )
-        if existing:
-            return {
-                "error": f"An appraisal already exists for {emp_code} in cycle '{appraisal_cycle}' (status: {existing.status})."
-            }
-
-        appraisal = AppraisalRecord(
-            emp_code=emp_code.upper(),
+        now = datetime.utcnow()
+        # Every value here is a validated Employee attribute or a str argument,
+        # so skip re-validating on construction
+        appraisal = AppraisalRecord.model_construct(
+            id=ObjectId(),
+            emp_code=emp_code,
             employee_name=emp.name,
             appraisal_cycle=appraisal_cycle,
             initiated_by=initiated_by,
@@ -62,10 +61,33 @@ class AppraisalService:
             old_department=emp.department,
             manager_feedback=manager_feedback,
             status="initiated",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
-        await appraisal.insert()
+
+        # Duplicate check + insert in one atomic upsert: an existing
+        # non-cancelled appraisal for the cycle is returned untouched, else
+        # ours is inserted. The unique partial index closes the race.
+        on_insert = appraisal.model_dump(exclude={"id", "revision_id", "emp_code", "appraisal_cycle"})
+        on_insert["_id"] = appraisal.id  # emp_code / cycle come from the filter
+        try:
+            doc = await AppraisalRecord.get_motor_collection().find_one_and_update(
+                {
+                    "emp_code": emp_code,
+                    "appraisal_cycle": appraisal_cycle,
+                    "status": {"$ne": "cancelled"},
+                },
+                {"$setOnInsert": on_insert},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+                projection={"status": 1},
+            )
+        except DuplicateKeyError:
+            doc = {"_id": None, "status": "in progress"}
+        if doc["_id"] != appraisal.id:
+            return {
+                "error": f"An appraisal already exists for {emp_code} in cycle '{appraisal_cycle}' (status: {doc['status']})."
+            }
 
         return {
             "success": True,
@@ -96,16 +118,17 @@ class AppraisalService:
         completed_by: Optional[str] = None,
     ) -> dict:
         """Finalize an appraisal — apply salary revision and update employee."""
-        emp = await self._emp_repo.find_by_emp_code(emp_code.upper())
+        # Employee and open appraisal are independent lookups — fetch together
+        emp, appraisal = await asyncio.gather(
+            self._emp_repo.find_by_emp_code(emp_code),
+            AppraisalRecord.find_one(
+                AppraisalRecord.emp_code == emp_code,
+                AppraisalRecord.appraisal_cycle == appraisal_cycle,
+                In(AppraisalRecord.status, ["initiated", "in_review"]),
+            ),
+        )
         if not emp:
             return {"error": f"Employee {emp_code} not found."}
-
-        # Find the open appraisal
-        appraisal = await AppraisalRecord.find_one(
-            AppraisalRecord.emp_code == emp_code.upper(),
-            AppraisalRecord.appraisal_cycle == appraisal_cycle,
-            AppraisalRecord.status.is_in(["initiated", "in_review"]),
-        )
         if not appraisal:
             return {
                 "error": (
@@ -134,38 +157,44 @@ class AppraisalService:
         final_department = new_department or emp.department
         eff_date = date.fromisoformat(effective_date) if effective_date else date.today()
 
-        # ── Update appraisal record ──
-        appraisal.rating = rating
-        appraisal.rating_label = derive_rating_label(rating)
-        appraisal.hike_pct = final_hike
-        appraisal.old_salary = old_salary
-        appraisal.new_salary = final_salary
-        appraisal.old_designation = emp.designation
-        appraisal.new_designation = final_designation
-        appraisal.old_department = emp.department
-        appraisal.new_department = final_department
-        appraisal.effective_date = eff_date
-        appraisal.status = "completed"
+        # ── Appraisal changes ──
+        now = datetime.utcnow()
+        changes = {
+            "rating": rating,
+            "rating_label": derive_rating_label(rating),
+            "hike_pct": final_hike,
+            "old_salary": old_salary,
+            "new_salary": final_salary,
+            "old_designation": emp.designation,
+            "new_designation": final_designation,
+            "old_department": emp.department,
+            "new_department": final_department,
+            "effective_date": eff_date,
+            "status": "completed",
+            "updated_at": now,
+        }
         if manager_feedback:
-            appraisal.manager_feedback = manager_feedback
+            changes["manager_feedback"] = manager_feedback
         if hr_comments:
-            appraisal.hr_comments = hr_comments
-        appraisal.updated_at = datetime.utcnow()
-        await appraisal.save()
+            changes["hr_comments"] = hr_comments
 
-        # ── Update Employee record ──
-        emp.salary = final_salary
-        emp.designation = final_designation
-        emp.department = final_department
-        emp.updated_at = datetime.utcnow()
-        await self._emp_repo.update(emp)
+        # ── Update appraisal and Employee records (independent writes) ──
+        await asyncio.gather(
+            appraisal.set(changes),
+            self._emp_repo.set_fields(emp, {
+                "salary": final_salary,
+                "designation": final_designation,
+                "department": final_department,
+                "updated_at": now,
+            }),
+        )
 
         # ── Auto-generate new payroll from revised CTC ──
         payroll_msg = ""
         try:
-            current_month = datetime.utcnow().strftime("%Y-%m")
+            current_month = now.strftime("%Y-%m")
             payroll_result = await self._hr_svc.create_payroll_from_ctc(
-                emp_code=emp_code.upper(),
+                emp_code=emp_code,
                 annual_ctc=final_salary,
                 month=current_month,
             )
@@ -184,7 +213,7 @@ class AppraisalService:
                 f"{payroll_msg}"
             ),
             "appraisal": {
-                "emp_code": emp_code.upper(),
+                "emp_code": emp_code,
                 "employee_name": emp.name,
                 "cycle": appraisal_cycle,
                 "rating": rating,
@@ -208,9 +237,15 @@ class AppraisalService:
         """Get appraisal history, optionally filtered by employee."""
         query = {}
         if emp_code:
-            query["emp_code"] = emp_code.upper()
+            query["emp_code"] = emp_code
 
-        records = await AppraisalRecord.find(query).sort("-created_at").limit(limit).to_list()
+        records = await (
+            AppraisalRecord.find(query)
+            .sort("-created_at")
+            .limit(limit)
+            .project(AppraisalHistoryView)
+            .to_list()
+        )
 
         return [
             {
@@ -246,17 +281,18 @@ class AppraisalService:
     ) -> dict:
         """Cancel an in-progress appraisal."""
         appraisal = await AppraisalRecord.find_one(
-            AppraisalRecord.emp_code == emp_code.upper(),
+            AppraisalRecord.emp_code == emp_code,
             AppraisalRecord.appraisal_cycle == appraisal_cycle,
-            AppraisalRecord.status.is_in(["initiated", "in_review"]),
+            In(AppraisalRecord.status, ["initiated", "in_review"]),
         )
         if not appraisal:
             return {"error": f"No open appraisal for {emp_code} in cycle '{appraisal_cycle}'."}
 
-        appraisal.status = "cancelled"
-        appraisal.hr_comments = f"Cancelled by {cancelled_by}: {reason}"
-        appraisal.updated_at = datetime.utcnow()
-        await appraisal.save()
+        await appraisal.set({
+            "status": "cancelled",
+            "hr_comments": f"Cancelled by {cancelled_by}: {reason}",
+            "updated_at": datetime.utcnow(),
+        })
 
         return {
             "success": True,
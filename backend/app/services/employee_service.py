@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-import json
 from datetime import date, datetime
 from typing import Optional
 
+from pydantic import TypeAdapter
+
 from app.exceptions import ConflictException, NotFoundException
 from app.models.employee import Employee, Address, EmergencyContact
+from app.models.schemas import EmployeeResponse
 from app.repositories.employee_repo import EmployeeRepository
 
+# Serialises a whole listing in one pass in pydantic-core
+_EMPLOYEE_LIST = TypeAdapter(list[EmployeeResponse])
+
 
 class EmployeeService:
     """Handles employee business logic, delegates persistence to repo."""
@@ -17,16 +22,15 @@ class EmployeeService:
     def __init__(self):
         self._repo = EmployeeRepository()
 
-    async def lookup(self, query: str) -> str:
+    async def lookup(self, query: str) -> dict:
         emp = await self._repo.find_by_query(query)
         if not emp:
-            return json.dumps({"error": f"No employee found for '{query}'."})
-        return emp.model_dump_json(indent=2, exclude={"id", "revision_id"})
+            return {"error": f"No employee found for '{query}'."}
+        # Profiles are sparse (most optional fields unset); omit the nulls
+        return emp.model_dump(mode="json", exclude={"id", "revision_id"}, exclude_none=True)
 
-    async def list_by_department(self, department: str) -> str:
-        emps = await self._repo.list_by_department(department)
-        results = [e.model_dump(mode="json", exclude={"id", "revision_id"}) for e in emps]
-        return json.dumps(results, indent=2, default=str)
+    async def list_by_department(self, department: str) -> list[dict]:
+        return await self._repo.list_by_department(department)
 
     async def add_employee(
         self,
@@ -54,12 +58,13 @@ class EmployeeService:
         bank_account: Optional[str] = None,
         bank_name: Optional[str] = None,
         ifsc_code: Optional[str] = None,
-    ) -> str:
+    ) -> dict:
         existing = await self._repo.find_by_emp_code(emp_code)
         if existing:
             raise ConflictException(f"Employee {emp_code} already exists.")
+        now = datetime.utcnow()
         emp = Employee(
-            emp_code=emp_code.upper(),
+            emp_code=emp_code,
             name=name,
             email=email,
             department=department,
@@ -82,13 +87,13 @@ class EmployeeService:
             bank_account=bank_account,
             bank_name=bank_name,
             ifsc_code=ifsc_code,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
         await self._repo.create(emp)
-        return json.dumps({"success": True, "message": f"Employee {emp_code} ({name}) added successfully."})
+        return {"success": True, "message": f"Employee {emp_code} ({name}) added successfully."}
 
-    async def update_employee(self, emp_code: str, **updates) -> str:
+    async def update_employee(self, emp_code: str, **updates) -> dict:
         emp = await self._repo.find_by_emp_code(emp_code)
         if not emp:
             raise NotFoundException("Employee", emp_code)
@@ -97,43 +102,44 @@ class EmployeeService:
                 setattr(emp, key, value)
         emp.updated_at = datetime.utcnow()
         await self._repo.update(emp)
-        return json.dumps({"success": True, "message": f"Employee {emp_code} updated successfully."})
+        return {"success": True, "message": f"Employee {emp_code} updated successfully."}
 
-    async def initiate_resignation(self, emp_code: str, resignation_date: str, reason: str) -> str:
-        emp = await self._repo.initiate_resignation(emp_code, resignation_date, reason)
+    async def initiate_resignation(self, emp_code: str, resignation_date: str, reason: str) -> dict:
+        emp = await self._repo.initiate_resignation(
+            emp_code, date.fromisoformat(resignation_date), reason
+        )
         if not emp:
             raise NotFoundException("Employee", emp_code)
-        return json.dumps({
+        return {
             "success": True,
             "message": f"Resignation initiated for {emp_code}. Status: resigned. Reason: {reason}.",
-        })
+        }
 
-    async def get_company_stats(self) -> str:
-        total = await self._repo.count({"status": "active"})
-        departments = await self._repo.get_all_departments()
-        avg_salary = await self._repo.get_average_salary()
-        return json.dumps({
+    async def get_company_stats(self) -> dict:
+        total, departments, avg_salary = await self._repo.get_active_stats()
+        return {
             "total_employees": total,
             "department_breakdown": departments,
             "average_salary": avg_salary,
-        }, indent=2)
+        }
 
-    async def list_all(self) -> list[dict]:
+    async def list_all(self) -> bytes:
+        """Active employees (projected to EmployeeResponse) as a JSON array."""
         emps = await self._repo.list_active()
-        return [e.model_dump(mode="json", exclude={"id", "revision_id"}) for e in emps]
+        return _EMPLOYEE_LIST.dump_json(emps)
 
     async def list_all_paginated(
         self,
         page: int = 1,
         page_size: int = 10,
         search: str | None = None,
-    ) -> str:
-        """Return paginated employee list with metadata as JSON."""
+    ) -> dict:
+        """Return paginated employee list with metadata."""
         import math
         emps, total = await self._repo.list_paginated(page, page_size, search)
         total_pages = math.ceil(total / page_size) if total else 1
         rows = [e.model_dump(mode="json", exclude={"id", "revision_id"}) for e in emps]
-        return json.dumps({
+        return {
             "employees": rows,
             "pagination": {
                 "page": page,
@@ -141,4 +147,4 @@ class EmployeeService:
                 "total_employees": total,
                 "total_pages": total_pages,
             },
-        }, indent=2, default=str)
+        }
@@ -9,44 +9,119 @@ from __future__ import annotations
 
 import json
 import math
-from datetime import datetime
-from typing import Optional
-
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.dump import get_dict
+from pydantic import BaseModel
+from pymongo import InsertOne, UpdateOne
+
+from app.cache.policy_cache import (
+    get_cached_policy,
+    get_stale_policy,
+    invalidate_policy_cache,
+    policy_lock,
+    set_cached_policy,
+)
 from app.models.hr_policy import (
+    ACTIVE_POLICY_INDEX,
     HRPolicy,
-    SalaryBreakup,
     LeavePolicy,
     TaxSlab,
-    PolicyChangeLog,
+    HRPolicyChangeLog,
     PolicyChangeEntry,
+    PolicyHistorySummary,
     # Only imported for the fallback in get_active_policy (first-ever boot)
     INITIAL_TAX_SLABS_NEW_REGIME,
     INITIAL_TAX_SLABS_OLD_REGIME,
     INITIAL_STATE_PROFESSIONAL_TAX,
     INITIAL_STATE_LEAVE_OVERRIDES,
+    state_key,
 )
 from app.models.leave import LeaveRecord
 from app.models.payroll import Payroll
+from app.repositories.employee_repo import EmployeeRepository
+
+# Pin the active-policy lookup to its compound index, newest version first
+_ACTIVE_QUERY = {"sort": [("version", -1)], "hint": ACTIVE_POLICY_INDEX}
+
+
+@dataclass(slots=True)
+class BreakupResult:
+    """Unrounded annual salary components, plus the fixed monthly amounts.
+
+    Internal callers (bulk payroll) read these directly; only the API-facing
+    breakup renders them into the nested response dict.
+    """
+    regime: str
+    basic: float
+    hra: float
+    special_allowance: float
+    medical_allowance: float
+    conveyance_allowance: float
+    pf_employer: float
+    gratuity: float
+    esi_employer: float
+    pf_employee: float
+    esi_employee: float
+    professional_tax: float
+    tds: float
+    gross: float
+    total_deductions: float
+    net: float
+    medical_monthly: float
+    conveyance_monthly: float
+    pt_monthly: float
 
 
 class HRPolicyService:
     """Business logic for HR policy, salary breakup, leave credits, TDS."""
 
+    def __init__(self):
+        self._emp_repo = EmployeeRepository()
+
     # ── Policy CRUD ──────────────────────────────────────
 
     async def get_active_policy(self) -> HRPolicy:
-        """Return the active HR policy, or create a seed one (first boot)."""
-        policy = await HRPolicy.find_one(HRPolicy.is_active == True)
-        if not policy:
-            # First-ever boot — create from INITIAL_ constants (only time they're used)
-            policy = HRPolicy(
-                state_professional_tax=INITIAL_STATE_PROFESSIONAL_TAX,
-                state_leave_overrides=INITIAL_STATE_LEAVE_OVERRIDES,
-                tax_slabs=INITIAL_TAX_SLABS_NEW_REGIME,
-                old_regime_tax_slabs=INITIAL_TAX_SLABS_OLD_REGIME,
-            )
-            await policy.insert()
-        return policy
+        """Return the active HR policy, or create a seed one (first boot).
+
+        Served from the in-process policy cache when fresh.
+        """
+        policy = get_cached_policy()
+        if policy:
+            return policy
+        async with policy_lock:
+            # Another caller may have refreshed the cache while we waited
+            policy = get_cached_policy()
+            if policy:
+                return policy
+
+            # Expired entry: a new version is a new document, so an unchanged
+            # active _id means the cached policy is still current
+            stale = get_stale_policy()
+            if stale is not None:
+                current = await HRPolicy.get_motor_collection().find_one(
+                    {"is_active": True}, {"_id": 1}, **_ACTIVE_QUERY
+                )
+                if current and current["_id"] == stale.id:
+                    set_cached_policy(stale)
+                    return stale
+
+            policy = await HRPolicy.find_one(HRPolicy.is_active == True, **_ACTIVE_QUERY)
+            if not policy:
+                # First-ever boot — create from INITIAL_ constants (only time they're used)
+                policy = HRPolicy(
+                    state_professional_tax=INITIAL_STATE_PROFESSIONAL_TAX,
+                    state_leave_overrides=INITIAL_STATE_LEAVE_OVERRIDES,
+                    tax_slabs=INITIAL_TAX_SLABS_NEW_REGIME,
+                    old_regime_tax_slabs=INITIAL_TAX_SLABS_OLD_REGIME,
+                )
+                await policy.insert()
+            set_cached_policy(policy)
+            return policy
 
     async def set_policy(
         self,
@@ -97,76 +172,48 @@ class HRPolicyService:
         old_version = old.version
         old_state = old.state
 
-        # Deactivate old
-        old.is_active = False
-        await old.save()
-
         state_lower = state.lower().strip()
+        key = state_key(state)
 
         # ── Build salary breakup: start from OLD, apply overrides ──
         # Look up state PT from the DB-stored state_professional_tax map
-        pt_map = old.state_professional_tax or {}
-        pt_for_state = pt_map.get(state_lower, pt_map.get("default", old.salary_breakup.professional_tax))
-
-        breakup = SalaryBreakup(
-            basic_pct=old.salary_breakup.basic_pct,
-            hra_pct=old.salary_breakup.hra_pct,
-            pf_employee_pct=old.salary_breakup.pf_employee_pct,
-            pf_employer_pct=old.salary_breakup.pf_employer_pct,
-            esi_employee_pct=old.salary_breakup.esi_employee_pct,
-            esi_employer_pct=old.salary_breakup.esi_employer_pct,
-            esi_threshold=old.salary_breakup.esi_threshold,
-            gratuity_pct=old.salary_breakup.gratuity_pct,
-            professional_tax=pt_for_state,
-            medical_allowance=old.salary_breakup.medical_allowance,
-            conveyance_allowance=old.salary_breakup.conveyance_allowance,
-        )
-        _BREAKUP_FIELDS = {
-            "basic_pct": basic_pct,
-            "hra_pct": hra_pct,
-            "pf_employee_pct": pf_employee_pct,
-            "pf_employer_pct": pf_employer_pct,
-            "esi_employee_pct": esi_employee_pct,
-            "esi_employer_pct": esi_employer_pct,
-            "esi_threshold": esi_threshold,
-            "gratuity_pct": gratuity_pct,
-            "professional_tax": professional_tax,  # explicit override
-            "medical_allowance": medical_allowance,
-            "conveyance_allowance": conveyance_allowance,
+        pt_map = old.state_pt_map()
+        pt_for_state = pt_map.get(key, pt_map.get("default", old.salary_breakup.professional_tax))
+
+        overrides = {
+            k: v for k, v in (
+                ("basic_pct", basic_pct),
+                ("hra_pct", hra_pct),
+                ("pf_employee_pct", pf_employee_pct),
+                ("pf_employer_pct", pf_employer_pct),
+                ("esi_employee_pct", esi_employee_pct),
+                ("esi_employer_pct", esi_employer_pct),
+                ("esi_threshold", esi_threshold),
+                ("gratuity_pct", gratuity_pct),
+                ("professional_tax", professional_tax),  # explicit override
+                ("medical_allowance", medical_allowance),
+                ("conveyance_allowance", conveyance_allowance),
+            ) if v is not None
         }
-        for field, val in _BREAKUP_FIELDS.items():
-            if val is not None:
-                setattr(breakup, field, val)
+        breakup = old.salary_breakup.model_copy(
+            update={"professional_tax": pt_for_state, **overrides}
+        )
 
         # ── Build leave policy: start from OLD, apply state overrides from DB, then user overrides ──
-        lp = LeavePolicy(
-            casual_leave=old.leave_policy.casual_leave,
-            sick_leave=old.leave_policy.sick_leave,
-            earned_leave=old.leave_policy.earned_leave,
-            maternity_leave=old.leave_policy.maternity_leave,
-            paternity_leave=old.leave_policy.paternity_leave,
-            compensatory_off=old.leave_policy.compensatory_off,
-            public_holidays=old.leave_policy.public_holidays,
-        )
-        # Apply state-level leave overrides from DB
-        leave_override_map = old.state_leave_overrides or {}
-        state_leave = leave_override_map.get(state_lower, {})
-        for k, v in state_leave.items():
-            if hasattr(lp, k):
-                setattr(lp, k, v)
-        # Then user explicit overrides (highest priority)
-        _LEAVE_FIELDS = {
-            "casual_leave": casual_leave,
-            "sick_leave": sick_leave,
-            "earned_leave": earned_leave,
-            "maternity_leave": maternity_leave,
-            "paternity_leave": paternity_leave,
-            "compensatory_off": compensatory_off,
-            "public_holidays": public_holidays,
-        }
-        for field, val in _LEAVE_FIELDS.items():
-            if val is not None:
-                setattr(lp, field, val)
+        state_leave = old.state_leave_map().get(key, {})
+        lp = old.leave_policy.model_copy(update={
+            **{k: v for k, v in state_leave.items() if k in LeavePolicy.model_fields},
+            # User explicit overrides (highest priority)
+            **{k: v for k, v in (
+                ("casual_leave", casual_leave),
+                ("sick_leave", sick_leave),
+                ("earned_leave", earned_leave),
+                ("maternity_leave", maternity_leave),
+                ("paternity_leave", paternity_leave),
+                ("compensatory_off", compensatory_off),
+                ("public_holidays", public_holidays),
+            ) if v is not None},
+        })
 
         # ── Tax config: carry forward from old, override if provided ──
         new_std_deduction = standard_deduction if standard_deduction is not None else old.standard_deduction
@@ -190,8 +237,15 @@ class HRPolicyService:
             new_old_std_deduction = old_regime_standard_deduction
 
         # State reference data: carry forward or replace
-        new_state_pt = state_professional_tax if state_professional_tax is not None else (old.state_professional_tax or {})
-        new_state_leave = state_leave_overrides if state_leave_overrides is not None else (old.state_leave_overrides or {})
+        # Replacement maps are stored with canonical keys
+        if state_professional_tax is not None:
+            new_state_pt = {state_key(k): v for k, v in state_professional_tax.items()}
+        else:
+            new_state_pt = old.state_professional_tax or {}
+        if state_leave_overrides is not None:
+            new_state_leave = {state_key(k): v for k, v in state_leave_overrides.items()}
+        else:
+            new_state_leave = old.state_leave_overrides or {}
 
         # ── Build change log by diffing old vs new ──
         changes: list[PolicyChangeEntry] = []
@@ -204,14 +258,7 @@ class HRPolicyService:
             changes.append(PolicyChangeEntry(field="tax_regime", old_value=old.tax_regime, new_value=tax_regime))
 
         # Salary breakup diffs
-        for field in ["basic_pct", "hra_pct", "pf_employee_pct", "pf_employer_pct",
-                       "esi_employee_pct", "esi_employer_pct", "esi_threshold",
-                       "gratuity_pct", "professional_tax", "medical_allowance",
-                       "conveyance_allowance"]:
-            ov = getattr(old.salary_breakup, field)
-            nv = getattr(breakup, field)
-            if ov != nv:
-                changes.append(PolicyChangeEntry(field=field, old_value=str(ov), new_value=str(nv)))
+        _diff_models(changes, old.salary_breakup, breakup)
 
         # Tax diffs
         if old.standard_deduction != new_std_deduction:
@@ -219,50 +266,35 @@ class HRPolicyService:
         if old.cess_pct != new_cess:
             changes.append(PolicyChangeEntry(field="cess_pct", old_value=str(old.cess_pct), new_value=str(new_cess)))
 
-        # Tax slab diffs
-        old_slab_str = "|".join(f"{s.min_income}-{s.max_income}@{s.rate_pct}" for s in old.tax_slabs)
-        new_slab_str = "|".join(f"{s.min_income}-{s.max_income}@{s.rate_pct}" for s in new_tax_slabs)
-        if old_slab_str != new_slab_str:
-            changes.append(PolicyChangeEntry(field="tax_slabs (new regime)", old_value=old_slab_str, new_value=new_slab_str))
-
-        # Old regime slab diffs
-        old_old_slab_str = "|".join(f"{s.min_income}-{s.max_income}@{s.rate_pct}" for s in old.old_regime_tax_slabs)
-        new_old_slab_str = "|".join(f"{s.min_income}-{s.max_income}@{s.rate_pct}" for s in new_old_regime_slabs)
-        if old_old_slab_str != new_old_slab_str:
-            changes.append(PolicyChangeEntry(field="tax_slabs (old regime)", old_value=old_old_slab_str, new_value=new_old_slab_str))
+        # Tax slab diffs (new regime, then old regime)
+        _diff_slabs(changes, "tax_slabs (new regime)", old.tax_slabs, new_tax_slabs)
+        _diff_slabs(changes, "tax_slabs (old regime)", old.old_regime_tax_slabs, new_old_regime_slabs)
 
         # Old regime standard deduction diff
         if old.old_regime_standard_deduction != new_old_std_deduction:
             changes.append(PolicyChangeEntry(field="old_regime_standard_deduction", old_value=str(old.old_regime_standard_deduction), new_value=str(new_old_std_deduction)))
 
-        # State config diffs
-        old_pt_str = json.dumps(old.state_professional_tax or {}, sort_keys=True)
-        new_pt_str = json.dumps(new_state_pt, sort_keys=True)
-        if old_pt_str != new_pt_str:
-            changes.append(PolicyChangeEntry(field="state_professional_tax", old_value=old_pt_str, new_value=new_pt_str))
-        old_sl_str = json.dumps(old.state_leave_overrides or {}, sort_keys=True)
-        new_sl_str = json.dumps(new_state_leave, sort_keys=True)
-        if old_sl_str != new_sl_str:
-            changes.append(PolicyChangeEntry(field="state_leave_overrides", old_value=old_sl_str, new_value=new_sl_str))
+        # State config diffs — only a supplied replacement map can differ;
+        # dicts compare directly and are serialised only for the log
+        old_pt = old.state_professional_tax or {}
+        if state_professional_tax is not None and old_pt != new_state_pt:
+            changes.append(PolicyChangeEntry(
+                field="state_professional_tax",
+                old_value=json.dumps(old_pt, sort_keys=True),
+                new_value=json.dumps(new_state_pt, sort_keys=True),
+            ))
+        old_sl = old.state_leave_overrides or {}
+        if state_leave_overrides is not None and old_sl != new_state_leave:
+            changes.append(PolicyChangeEntry(
+                field="state_leave_overrides",
+                old_value=json.dumps(old_sl, sort_keys=True),
+                new_value=json.dumps(new_state_leave, sort_keys=True),
+            ))
 
         # Leave policy diffs
-        for field in ["casual_leave", "sick_leave", "earned_leave", "maternity_leave",
-                       "paternity_leave", "compensatory_off", "public_holidays"]:
-            ov = getattr(old.leave_policy, field)
-            nv = getattr(lp, field)
-            if ov != nv:
-                changes.append(PolicyChangeEntry(field=field, old_value=str(ov), new_value=str(nv)))
-
-        change_log = PolicyChangeLog(
-            changed_by=created_by or "system",
-            changed_at=datetime.utcnow(),
-            reason=change_reason,
-            changes=changes,
-        )
-
-        # Carry forward history
-        prev_history = old.change_history or []
+        _diff_models(changes, old.leave_policy, lp)
 
+        now = datetime.now(timezone.utc)
         policy = HRPolicy(
             policy_name=f"India HR Policy — {state.title()}",
             state=state_lower,
@@ -278,13 +310,34 @@ class HRPolicyService:
             state_professional_tax=new_state_pt,
             state_leave_overrides=new_state_leave,
             is_active=True,
-            change_history=[*prev_history, change_log],
             version=old_version + 1,
             created_by=created_by,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
-        await policy.insert()
+        policy.id = PydanticObjectId()
+        # Swap old → new in one ordered bulk write (one round trip), under the
+        # cache lock so concurrent readers neither observe the gap with no
+        # active policy nor re-cache the old one
+        async with policy_lock:
+            invalidate_policy_cache()
+            await HRPolicy.get_motor_collection().bulk_write(
+                [
+                    UpdateOne({"_id": old.id}, {"$set": {"is_active": False}}),
+                    InsertOne(get_dict(policy, to_db=True)),
+                ],
+                ordered=True,
+            )
+            old.is_active = False
+            set_cached_policy(policy)
+
+        await HRPolicyChangeLog(
+            policy_version=policy.version,
+            changed_by=created_by or "system",
+            changed_at=now,
+            reason=change_reason,
+            changes=changes,
+        ).insert()
 
         changes_summary = ", ".join(f"{c.field}: {c.old_value}→{c.new_value}" for c in changes) if changes else "No field changes"
 
@@ -336,69 +389,42 @@ class HRPolicyService:
         }
 
     async def get_policy_history(self, limit: int = 10) -> list[dict]:
-        """Return policy change history across all versions (most recent first)."""
-        policies = await HRPolicy.find().sort("-version").limit(limit + 5).to_list()
-
-        history = []
-        for pol in policies:
-            entry = {
-                "version": pol.version,
-                "policy_name": pol.policy_name,
-                "state": pol.state.title(),
-                "is_active": pol.is_active,
-                "created_by": pol.created_by,
-                "created_at": pol.created_at.isoformat() if pol.created_at else None,
-                "leave_policy": {
-                    "casual_leave": pol.leave_policy.casual_leave,
-                    "sick_leave": pol.leave_policy.sick_leave,
-                    "earned_leave": pol.leave_policy.earned_leave,
-                    "maternity_leave": pol.leave_policy.maternity_leave,
-                    "paternity_leave": pol.leave_policy.paternity_leave,
-                    "compensatory_off": pol.leave_policy.compensatory_off,
-                    "public_holidays": pol.leave_policy.public_holidays,
-                },
-                "salary_breakup": {
-                    "basic_pct": pol.salary_breakup.basic_pct,
-                    "hra_pct": pol.salary_breakup.hra_pct,
-                    "pf_employee_pct": pol.salary_breakup.pf_employee_pct,
-                    "pf_employer_pct": pol.salary_breakup.pf_employer_pct,
-                    "esi_employee_pct": pol.salary_breakup.esi_employee_pct,
-                    "esi_employer_pct": pol.salary_breakup.esi_employer_pct,
-                    "esi_threshold": pol.salary_breakup.esi_threshold,
-                    "gratuity_pct": pol.salary_breakup.gratuity_pct,
-                    "professional_tax": pol.salary_breakup.professional_tax,
-                    "medical_allowance": pol.salary_breakup.medical_allowance,
-                    "conveyance_allowance": pol.salary_breakup.conveyance_allowance,
-                },
-                "tax_config": {
-                    "company_default_regime": pol.tax_regime,
-                    "new_regime": {
-                        "standard_deduction": pol.standard_deduction,
-                        "tax_slabs": [{"min": s.min_income, "max": s.max_income, "rate": s.rate_pct} for s in pol.tax_slabs],
-                    },
-                    "old_regime": {
-                        "standard_deduction": pol.old_regime_standard_deduction,
-                        "tax_slabs": [{"min": s.min_income, "max": s.max_income, "rate": s.rate_pct} for s in pol.old_regime_tax_slabs],
-                    },
-                    "cess_pct": pol.cess_pct,
-                },
-                "state_professional_tax": pol.state_professional_tax,
-                "state_leave_overrides": pol.state_leave_overrides,
-                "changes": [],
-            }
-            for log in pol.change_history:
-                entry["changes"].append({
-                    "changed_by": log.changed_by,
-                    "changed_at": log.changed_at.isoformat(),
-                    "reason": log.reason,
-                    "fields_changed": [
-                        {"field": c.field, "from": c.old_value, "to": c.new_value}
-                        for c in log.changes
-                    ],
-                })
+        """Return policy change history across all versions (most recent first).
+
+        Listings omit the per-state reference maps; use `get_policy_version`
+        for a single version in full.
+        """
+        # Render each version as the cursor yields it; change logs are
+        # attached afterwards, in one index range scan over these versions
+        history: list[dict] = []
+        by_version: dict[int, dict] = {}
+        async for pol in (
+            HRPolicy.find().sort("-version").limit(limit).project(PolicyHistorySummary)
+        ):
+            entry = by_version[pol.version] = _history_entry(pol, ())
             history.append(entry)
 
-        return history[:limit]
+        if by_version:
+            async for log in HRPolicyChangeLog.find(
+                {"policy_version": {"$gte": min(by_version), "$lte": max(by_version)}}
+            ).sort([("policy_version", -1), ("changed_at", -1)]):
+                entry = by_version.get(log.policy_version)
+                if entry is not None:
+                    entry["changes"].append(_change_entry(log))
+        return history
+
+    async def get_policy_version(self, version: int) -> dict | None:
+        """Return one policy version in full, including state maps and changes."""
+        pol = await HRPolicy.find_one(HRPolicy.version == version)
+        if not pol:
+            return None
+        logs = await HRPolicyChangeLog.find(
+            HRPolicyChangeLog.policy_version == version
+        ).sort("-changed_at").to_list()
+        entry = _history_entry(pol, logs)
+        entry["state_professional_tax"] = pol.state_professional_tax
+        entry["state_leave_overrides"] = pol.state_leave_overrides
+        return entry
 
     # ── Salary Breakup ───────────────────────────────────
 
@@ -409,31 +435,104 @@ class HRPolicyService:
         Otherwise, the company default regime from the policy is used.
         """
         policy = await self.get_active_policy()
+        return self._compute_breakup_with_policy(policy, annual_ctc, tax_regime)
+
+    def _compute_breakup_with_policy(
+        self, policy: HRPolicy, annual_ctc: float, tax_regime: str | None = None
+    ) -> dict:
+        """Pure breakup computation against an already-fetched policy."""
+        res = self._compute_breakup_core(policy, annual_ctc, tax_regime)
+        return self._render_breakup(policy, annual_ctc, res)
+
+    def _render_breakup(self, policy: HRPolicy, annual_ctc: float, res: BreakupResult) -> dict:
+        """Shape a breakup result into the rounded annual/monthly response."""
+        # Round every component in one pass; fixed allowances and PT are
+        # configured monthly, so their monthly figure is the configured one
+        amt = {
+            name: {"annual": round(annual), "monthly": round(annual / 12)}
+            for name, annual in (
+                ("basic", res.basic),
+                ("hra", res.hra),
+                ("special_allowance", res.special_allowance),
+                ("pf_employer", res.pf_employer),
+                ("gratuity", res.gratuity),
+                ("esi_employer", res.esi_employer),
+                ("pf_employee", res.pf_employee),
+                ("esi_employee", res.esi_employee),
+                ("tds", res.tds),
+                ("gross", res.gross),
+                ("total_deductions", res.total_deductions),
+                ("net", res.net),
+            )
+        }
+        for name, annual, monthly in (
+            ("medical_allowance", res.medical_allowance, res.medical_monthly),
+            ("conveyance_allowance", res.conveyance_allowance, res.conveyance_monthly),
+            ("professional_tax", res.professional_tax, res.pt_monthly),
+        ):
+            amt[name] = {"annual": round(annual), "monthly": round(monthly)}
+
+        return {
+            "annual_ctc": annual_ctc,
+            "monthly_ctc": round(annual_ctc / 12),
+            "breakup": {
+                "basic": amt["basic"],
+                "hra": amt["hra"],
+                "special_allowance": amt["special_allowance"],
+                "medical_allowance": amt["medical_allowance"],
+                "conveyance_allowance": amt["conveyance_allowance"],
+            },
+            "employer_contributions": {
+                "pf_employer": amt["pf_employer"],
+                "gratuity": amt["gratuity"],
+                "esi_employer": amt["esi_employer"],
+            },
+            "deductions": {
+                "pf_employee": amt["pf_employee"],
+                "esi_employee": amt["esi_employee"],
+                "professional_tax": amt["professional_tax"],
+                "tds": amt["tds"],
+            },
+            "gross_salary": amt["gross"],
+            "total_deductions": amt["total_deductions"],
+            "net_take_home": amt["net"],
+            "policy": {
+                "state": policy.state.title(),
+                "is_metro": policy.is_metro,
+                "tax_regime": res.regime,
+            },
+        }
+
+    def _compute_breakup_core(
+        self, policy: HRPolicy, annual_ctc: float, tax_regime: str | None = None
+    ) -> BreakupResult:
+        """Compute the unrounded annual salary components for a CTC."""
         b = policy.salary_breakup
+        r = policy.breakup_ratios()
 
         effective_regime = tax_regime or policy.tax_regime
 
         monthly_ctc = annual_ctc / 12
 
         # Core components (annual)
-        basic_annual = annual_ctc * (b.basic_pct / 100)
-        hra_annual = annual_ctc * (b.hra_pct / 100)
+        basic_annual = annual_ctc * r.basic
+        hra_annual = annual_ctc * r.hra
 
         # Employer PF (12% of Basic, capped at 15000/month basic for PF)
         pf_basic_monthly = min(basic_annual / 12, 15000)
-        pf_employer_annual = pf_basic_monthly * (b.pf_employer_pct / 100) * 12
-        pf_employee_annual = pf_basic_monthly * (b.pf_employee_pct / 100) * 12
+        pf_employer_annual = pf_basic_monthly * r.pf_employer * 12
+        pf_employee_annual = pf_basic_monthly * r.pf_employee * 12
 
         # Gratuity (4.81% of Basic)
-        gratuity_annual = basic_annual * (b.gratuity_pct / 100)
+        gratuity_annual = basic_annual * r.gratuity
 
         # ESI (only if monthly gross < threshold)
         monthly_gross = monthly_ctc
         esi_employer_annual = 0
         esi_employee_annual = 0
         if monthly_gross < b.esi_threshold:
-            esi_employer_annual = monthly_gross * (b.esi_employer_pct / 100) * 12
-            esi_employee_annual = monthly_gross * (b.esi_employee_pct / 100) * 12
+            esi_employer_annual = monthly_gross * r.esi_employer * 12
+            esi_employee_annual = monthly_gross * r.esi_employee * 12
 
         # Professional Tax
         pt_annual = b.professional_tax * 12
@@ -451,88 +550,49 @@ class HRPolicyService:
         # Gross salary (what employee sees before deductions)
         gross_annual = (basic_annual + hra_annual + special_allowance_annual +
                         medical_annual + conveyance_annual)
-        gross_monthly = gross_annual / 12
 
         # Employee deductions
         total_deductions_annual = pf_employee_annual + esi_employee_annual + pt_annual
 
         # TDS (income tax)
         tds_annual = self._compute_tds(gross_annual, pf_employee_annual, policy, regime=effective_regime)
-        tds_monthly = round(tds_annual / 12)
 
         total_deductions_annual += tds_annual
 
-        # Net take-home
-        net_annual = gross_annual - total_deductions_annual
-        net_monthly = round(net_annual / 12)
-
-        return {
-            "annual_ctc": annual_ctc,
-            "monthly_ctc": round(monthly_ctc),
-            "breakup": {
-                "basic": {"annual": round(basic_annual), "monthly": round(basic_annual / 12)},
-                "hra": {"annual": round(hra_annual), "monthly": round(hra_annual / 12)},
-                "special_allowance": {"annual": round(special_allowance_annual), "monthly": round(special_allowance_annual / 12)},
-                "medical_allowance": {"annual": round(medical_annual), "monthly": round(b.medical_allowance)},
-                "conveyance_allowance": {"annual": round(conveyance_annual), "monthly": round(b.conveyance_allowance)},
-            },
-            "employer_contributions": {
-                "pf_employer": {"annual": round(pf_employer_annual), "monthly": round(pf_employer_annual / 12)},
-                "gratuity": {"annual": round(gratuity_annual), "monthly": round(gratuity_annual / 12)},
-                "esi_employer": {"annual": round(esi_employer_annual), "monthly": round(esi_employer_annual / 12)},
-            },
-            "deductions": {
-                "pf_employee": {"annual": round(pf_employee_annual), "monthly": round(pf_employee_annual / 12)},
-                "esi_employee": {"annual": round(esi_employee_annual), "monthly": round(esi_employee_annual / 12)},
-                "professional_tax": {"annual": round(pt_annual), "monthly": round(b.professional_tax)},
-                "tds": {"annual": round(tds_annual), "monthly": tds_monthly},
-            },
-            "gross_salary": {"annual": round(gross_annual), "monthly": round(gross_monthly)},
-            "total_deductions": {"annual": round(total_deductions_annual), "monthly": round(total_deductions_annual / 12)},
-            "net_take_home": {"annual": round(net_annual), "monthly": net_monthly},
-            "policy": {
-                "state": policy.state.title(),
-                "is_metro": policy.is_metro,
-                "tax_regime": effective_regime,
-            },
-        }
+        return BreakupResult(
+            regime=effective_regime,
+            basic=basic_annual,
+            hra=hra_annual,
+            special_allowance=special_allowance_annual,
+            medical_allowance=medical_annual,
+            conveyance_allowance=conveyance_annual,
+            pf_employer=pf_employer_annual,
+            gratuity=gratuity_annual,
+            esi_employer=esi_employer_annual,
+            pf_employee=pf_employee_annual,
+            esi_employee=esi_employee_annual,
+            professional_tax=pt_annual,
+            tds=tds_annual,
+            gross=gross_annual,
+            total_deductions=total_deductions_annual,
+            # Net take-home
+            net=gross_annual - total_deductions_annual,
+            medical_monthly=b.medical_allowance,
+            conveyance_monthly=b.conveyance_allowance,
+            pt_monthly=b.professional_tax,
+        )
 
     def _compute_tds(self, gross_annual: float, pf_annual: float, policy: HRPolicy, regime: str | None = None) -> float:
         """Compute annual income tax (TDS) based on chosen regime."""
         effective_regime = regime or policy.tax_regime
-
-        if effective_regime == "old":
-            std_ded = policy.old_regime_standard_deduction
-            slabs = policy.old_regime_tax_slabs
-        else:
-            std_ded = policy.standard_deduction
-            slabs = policy.tax_slabs
-
-        taxable = gross_annual - std_ded
-        if effective_regime == "old":
-            taxable -= pf_annual  # Section 80C in old regime
-        taxable = max(0, taxable)
-
-        # Rebate u/s 87A: If taxable ≤ 12,00,000 under new regime → zero tax
-        if effective_regime == "new" and taxable <= 1200000:
-            return 0
-        # Old regime rebate u/s 87A: taxable ≤ 5,00,000
-        if effective_regime == "old" and taxable <= 500000:
-            return 0
-
-        tax = 0.0
-        for slab in slabs:
-            if taxable <= 0:
-                break
-            upper = slab.max_income if slab.max_income > 0 else float("inf")
-            slab_width = upper - slab.min_income
-            taxable_in_slab = min(taxable, slab_width)
-            tax += taxable_in_slab * (slab.rate_pct / 100)
-            taxable -= taxable_in_slab
-
-        # Add cess
-        tax += tax * (policy.cess_pct / 100)
-        return round(tax)
+        kernel = _tds_kernels.get((policy.id, effective_regime))
+        if kernel is None:
+            if len(_tds_kernels) >= _TDS_KERNEL_CACHE_SIZE:
+                _tds_kernels.clear()
+            kernel = _tds_kernels[(policy.id, effective_regime)] = _build_tds_kernel(
+                policy, effective_regime
+            )
+        return kernel(gross_annual, pf_annual)
 
     # ── Leave Credits ────────────────────────────────────
 
@@ -560,35 +620,212 @@ class HRPolicyService:
         """
         # Look up employee's chosen regime if not explicitly provided
         if tax_regime is None:
-            from app.repositories.employee_repo import EmployeeRepository
-            emp_repo = EmployeeRepository()
-            emp = await emp_repo.find_by_emp_code(emp_code.upper())
+            emp = await self._emp_repo.find_by_emp_code(emp_code)
             if emp:
                 tax_regime = emp.tax_regime
 
-        breakup = await self.compute_salary_breakup(annual_ctc, tax_regime=tax_regime)
-
-        payroll = Payroll(
-            emp_code=emp_code.upper(),
-            month=month,
-            basic=breakup["breakup"]["basic"]["monthly"],
-            hra=breakup["breakup"]["hra"]["monthly"],
-            allowances=(
-                breakup["breakup"]["special_allowance"]["monthly"] +
-                breakup["breakup"]["medical_allowance"]["monthly"] +
-                breakup["breakup"]["conveyance_allowance"]["monthly"]
-            ),
-            deductions=(
-                breakup["deductions"]["pf_employee"]["monthly"] +
-                breakup["deductions"]["professional_tax"]["monthly"] +
-                breakup["deductions"]["tds"]["monthly"] +
-                breakup["deductions"]["esi_employee"]["monthly"]
-            ),
-            net_pay=breakup["net_take_home"]["monthly"],
-        )
-        await payroll.insert()
+        policy = await self.get_active_policy()
+        res = self._compute_breakup_core(policy, annual_ctc, tax_regime)
+        await _payroll_from_result(emp_code, month, res).insert()
+        breakup = self._render_breakup(policy, annual_ctc, res)
         return {
             "success": True,
             "message": f"Payroll for {emp_code} ({month}) created with net pay ₹{breakup['net_take_home']['monthly']:,}.",
             "payroll": breakup,
         }
+
+    async def create_payrolls_bulk(self, rows: list[tuple[str, float, str, str | None]]) -> dict:
+        """Generate payroll records for many employees in one write.
+
+        *rows* are ``(emp_code, annual_ctc, month, tax_regime)``; a ``None``
+        regime falls back to the employee's chosen regime. The policy and the
+        regimes are fetched once for the whole batch.
+        """
+        if not rows:
+            return {"success": True, "created": 0, "message": "No payroll rows to create."}
+
+        policy = await self.get_active_policy()
+        missing = [code for code, _, _, regime in rows if regime is None]
+        regimes = await self._emp_repo.find_tax_regimes(missing) if missing else {}
+
+        # Salary bands repeat across a payroll run — compute each distinct
+        # (CTC, regime) breakup once and reuse it for every matching row
+        results: dict[tuple[float, str | None], BreakupResult] = {}
+        docs = []
+        for emp_code, annual_ctc, month, regime in rows:
+            key = (annual_ctc, regime or regimes.get(emp_code))
+            res = results.get(key)
+            if res is None:
+                res = results[key] = self._compute_breakup_core(policy, *key)
+            docs.append(_payroll_from_result(emp_code, month, res))
+
+        await Payroll.insert_many(docs, ordered=False)
+        return {
+            "success": True,
+            "created": len(docs),
+            "message": f"Created {len(docs)} payroll record(s).",
+        }
+
+    async def run_payroll(self, month: str) -> dict:
+        """Create *month*'s slip for every active employee that lacks one.
+
+        Each employee's salary is taken as their annual CTC and their chosen
+        tax regime applies, as for the slip generated when they were added.
+        """
+        done = set(await Payroll.get_motor_collection().distinct("emp_code", {"month": month}))
+        rows = [
+            (e.emp_code, e.salary, month, None)
+            for e in await self._emp_repo.list_active()
+            if e.emp_code not in done
+        ]
+        result = await self.create_payrolls_bulk(rows)
+        result["already_generated"] = len(done)
+        if done:
+            result["message"] += f" {len(done)} employee(s) already had a slip for {month}."
+        return result
+
+
+# Per-(policy _id, regime) TDS functions; a policy version never changes once
+# stored, so its kernels stay valid. Bounded since only the active policy's
+# kernels are hot.
+_TDS_KERNEL_CACHE_SIZE = 16
+_tds_kernels: dict[tuple, Callable[[float, float], int]] = {}
+
+
+def _build_tds_kernel(policy: HRPolicy, regime: str) -> Callable[[float, float], int]:
+    """Specialise the TDS computation for one policy and regime.
+
+    Deduction, rebate limit, cess multiplier and slab table are bound as
+    closure constants, so a call is a few arithmetic ops plus one bisect.
+    """
+    if regime == "old":
+        # Section 80C (PF) is deductible in the old regime only
+        std_ded = policy.old_regime_standard_deduction
+        pf_factor = 1.0
+        # Old regime rebate u/s 87A: taxable ≤ 5,00,000
+        rebate_limit = 500000
+    else:
+        std_ded = policy.standard_deduction
+        pf_factor = 0.0
+        # Rebate u/s 87A: If taxable ≤ 12,00,000 under new regime → zero tax
+        rebate_limit = 1200000 if regime == "new" else 0
+    starts, rates, base_tax = policy.slab_table(regime)
+    cess_factor = 1 + policy.cess_pct / 100
+
+    def tds(gross_annual: float, pf_annual: float) -> int:
+        taxable = gross_annual - std_ded - pf_factor * pf_annual
+        if taxable <= rebate_limit or taxable <= 0:
+            return 0
+        idx = bisect_right(starts, taxable) - 1
+        return round((base_tax[idx] + (taxable - starts[idx]) * rates[idx]) * cess_factor)
+
+    return tds
+
+
+def _diff_models(changes: list[PolicyChangeEntry], old: BaseModel, new: BaseModel) -> None:
+    """Append a change entry for every field that differs between two snapshots."""
+    new_snap = new.model_dump()
+    for field, ov in old.model_dump().items():
+        nv = new_snap[field]
+        if ov != nv:
+            changes.append(PolicyChangeEntry(field=field, old_value=str(ov), new_value=str(nv)))
+
+
+def _diff_slabs(
+    changes: list[PolicyChangeEntry], label: str, old: list[TaxSlab], new: list[TaxSlab]
+) -> None:
+    """Compare slab lists as tuples; build the log strings only if they differ."""
+    old_t = [(s.min_income, s.max_income, s.rate_pct) for s in old]
+    new_t = [(s.min_income, s.max_income, s.rate_pct) for s in new]
+    if old_t != new_t:
+        changes.append(PolicyChangeEntry(
+            field=label,
+            old_value="|".join(f"{lo}-{hi}@{r}" for lo, hi, r in old_t),
+            new_value="|".join(f"{lo}-{hi}@{r}" for lo, hi, r in new_t),
+        ))
+
+
+def _history_entry(pol: PolicyHistorySummary | HRPolicy, logs) -> dict:
+    """Render one policy version and its change logs for history views."""
+    return {
+        "version": pol.version,
+        "policy_name": pol.policy_name,
+        "state": pol.state.title(),
+        "is_active": pol.is_active,
+        "created_by": pol.created_by,
+        "created_at": pol.created_at.isoformat() if pol.created_at else None,
+        "leave_policy": {
+            "casual_leave": pol.leave_policy.casual_leave,
+            "sick_leave": pol.leave_policy.sick_leave,
+            "earned_leave": pol.leave_policy.earned_leave,
+            "maternity_leave": pol.leave_policy.maternity_leave,
+            "paternity_leave": pol.leave_policy.paternity_leave,
+            "compensatory_off": pol.leave_policy.compensatory_off,
+            "public_holidays": pol.leave_policy.public_holidays,
+        },
+        "salary_breakup": {
+            "basic_pct": pol.salary_breakup.basic_pct,
+            "hra_pct": pol.salary_breakup.hra_pct,
+            "pf_employee_pct": pol.salary_breakup.pf_employee_pct,
+            "pf_employer_pct": pol.salary_breakup.pf_employer_pct,
+            "esi_employee_pct": pol.salary_breakup.esi_employee_pct,
+            "esi_employer_pct": pol.salary_breakup.esi_employer_pct,
+            "esi_threshold": pol.salary_breakup.esi_threshold,
+            "gratuity_pct": pol.salary_breakup.gratuity_pct,
+            "professional_tax": pol.salary_breakup.professional_tax,
+            "medical_allowance": pol.salary_breakup.medical_allowance,
+            "conveyance_allowance": pol.salary_breakup.conveyance_allowance,
+        },
+        "tax_config": {
+            "company_default_regime": pol.tax_regime,
+            "new_regime": {
+                "standard_deduction": pol.standard_deduction,
+                "tax_slabs": [{"min": s.min_income, "max": s.max_income, "rate": s.rate_pct} for s in pol.tax_slabs],
+            },
+            "old_regime": {
+                "standard_deduction": pol.old_regime_standard_deduction,
+                "tax_slabs": [{"min": s.min_income, "max": s.max_income, "rate": s.rate_pct} for s in pol.old_regime_tax_slabs],
+            },
+            "cess_pct": pol.cess_pct,
+        },
+        "changes": [_change_entry(log) for log in logs],
+    }
+
+
+def _change_entry(log: HRPolicyChangeLog) -> dict:
+    """Render one change-log document for history views."""
+    return {
+        "changed_by": log.changed_by,
+        "changed_at": log.changed_at.isoformat(),
+        "reason": log.reason,
+        "fields_changed": [
+            {"field": c.field, "from": c.old_value, "to": c.new_value}
+            for c in log.changes
+        ],
+    }
+
+
+def _payroll_from_result(emp_code: str, month: str, res: BreakupResult) -> Payroll:
+    """Build the monthly Payroll slip from a breakup result.
+
+    Rounds each component exactly as the breakup response does, so a slip
+    always agrees with the breakup shown alongside it.
+    """
+    return Payroll(
+        emp_code=emp_code,
+        month=month,
+        basic=round(res.basic / 12),
+        hra=round(res.hra / 12),
+        allowances=(
+            round(res.special_allowance / 12) +
+            round(res.medical_monthly) +
+            round(res.conveyance_monthly)
+        ),
+        deductions=(
+            round(res.pf_employee / 12) +
+            round(res.pt_monthly) +
+            round(res.tds / 12) +
+            round(res.esi_employee / 12)
+        ),
+        net_pay=round(res.net / 12),
+    )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import json
+from datetime import date
 from typing import Optional
 
 from app.repositories.leave_repo import LeaveRepository
@@ -13,28 +13,32 @@ class LeaveService:
     def __init__(self):
         self._repo = LeaveRepository()
 
-    async def get_records(self, emp_code: str, status: Optional[str] = None) -> str:
-        records = await self._repo.find_by_emp_code(emp_code, status)
-        results = [r.model_dump(mode="json", exclude={"id", "revision_id"}) for r in records]
-        return json.dumps(results, indent=2, default=str)
+    async def get_records(self, emp_code: str, status: Optional[str] = None) -> list[dict]:
+        # Rows go straight into the tool result; the orchestrator's JSON
+        # encoder renders the dates
+        return await self._repo.find_by_emp_code(emp_code, status)
 
     async def apply_leave(
         self, emp_code: str, leave_type: str, start_date: str, end_date: str, reason: str
-    ) -> str:
-        record = await self._repo.apply_leave(emp_code, leave_type, start_date, end_date, reason)
-        return json.dumps({
+    ) -> dict:
+        await self._repo.apply_leave(
+            emp_code, leave_type, date.fromisoformat(start_date), date.fromisoformat(end_date), reason
+        )
+        return {
             "success": True,
             "message": f"Leave applied for {emp_code} from {start_date} to {end_date}.",
-        })
+        }
 
     async def approve_or_reject(
         self, emp_code: str, start_date: str, action: str, approved_by: str
-    ) -> str:
+    ) -> dict:
         new_status = "approved" if action.lower() == "approve" else "rejected"
-        record = await self._repo.update_status(emp_code, start_date, new_status, approved_by)
-        if not record:
-            return json.dumps({"error": f"No pending leave found for {emp_code} starting {start_date}."})
-        return json.dumps({
+        updated = await self._repo.update_status(
+            emp_code, date.fromisoformat(start_date), new_status, approved_by
+        )
+        if not updated:
+            return {"error": f"No pending leave found for {emp_code} starting {start_date}."}
+        return {
             "success": True,
             "message": f"Leave for {emp_code} starting {start_date} has been {new_status}.",
-        })
+        }
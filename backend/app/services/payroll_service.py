@@ -2,27 +2,46 @@
 
 from __future__ import annotations
 
-import json
+from typing import AsyncIterator
 
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.schemas import PayrollResponse
 from app.repositories.payroll_repo import PayrollRepository
 
+# Built once — dumps a whole slip list in a single pydantic-core call.
+# Slips are projected to PayrollResponse, so there are no fields to exclude.
+_SLIP_LIST = TypeAdapter(list[PayrollResponse])
+
 
 class PayrollService:
 
     def __init__(self):
         self._repo = PayrollRepository()
 
-    async def get_slip(self, emp_code: str, month: str | None = None) -> str:
+    async def get_slip(self, emp_code: str, month: str | None = None) -> dict | list[dict]:
         if month:
             record = await self._repo.find_by_emp_and_month(emp_code, month)
             if record:
-                return record.model_dump_json(indent=2, exclude={"id", "revision_id"})
-            return json.dumps({"error": f"No payroll record found for {emp_code} in {month}."})
+                return record.model_dump()
+            return {"error": f"No payroll record found for {emp_code} in {month}."}
         else:
             records = await self._repo.find_all_by_emp(emp_code)
             if records:
-                return json.dumps(
-                    [json.loads(r.model_dump_json(exclude={"id", "revision_id"})) for r in records],
-                    indent=2,
-                )
-            return json.dumps({"error": f"No payroll records found for {emp_code}."})
+                return _SLIP_LIST.dump_python(records)
+            return {"error": f"No payroll records found for {emp_code}."}
+
+    async def iter_slips(self, emp_code: str, pretty: bool = False) -> AsyncIterator[bytes]:
+        """Stream all of an employee's slips as a JSON array, row by row.
+
+        Memory stays flat however long the payroll history is. Rows are
+        compact unless *pretty* is set.
+        """
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        yield b"["
+        sep = b""
+        async for row in self._repo.iter_by_emp(emp_code):
+            yield sep + orjson.dumps(row, option=option)
+            sep = b","
+        yield b"]"
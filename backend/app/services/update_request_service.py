@@ -7,14 +7,75 @@ document automatically.
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Optional
 
+from bson import ObjectId
+from pydantic import TypeAdapter
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
 from app.models.update_request import UpdateRequest, FieldChange
 from app.models.employee import Employee
 from app.repositories.employee_repo import EmployeeRepository
 
+# Only these (safe) fields may be changed by employees
+_ALLOWED_FIELDS: frozenset[str] = frozenset({
+    "name", "email", "department", "designation",
+    "manager_name",
+})
+_ALLOWED_FIELDS_LIST = ", ".join(sorted(_ALLOWED_FIELDS))
+# Every allowed field is a real Employee attribute, so no hasattr guards
+if not _ALLOWED_FIELDS <= Employee.model_fields.keys():
+    raise RuntimeError(
+        f"Update-request fields missing from Employee: {sorted(_ALLOWED_FIELDS - Employee.model_fields.keys())}"
+    )
+
+# Employee fields a review needs: the name for messages, plus the editable
+# fields to spot no-op approvals
+_EMP_REVIEW_FIELDS = {"_id": 0, **dict.fromkeys(_ALLOWED_FIELDS, 1)}
+
+_LIST_FIELDS = {
+    "emp_code": 1, "status": 1, "reason": 1, "requested_fields": 1,
+    "reviewed_by": 1, "review_comment": 1, "created_at": 1,
+}
+
+_FIELD_CHANGES = TypeAdapter(list[FieldChange])
+
+# Required keys of a listing row, fetched in one C-level call per row
+_LIST_ROW_KEYS = itemgetter("_id", "emp_code", "_emp", "status", "reason", "requested_fields", "created_at")
+
+
+def _list_row(r: dict) -> dict:
+    """Shape a raw aggregation row for the listing response."""
+    rid, emp_code, emp, status, reason, fields, created_at = _LIST_ROW_KEYS(r)
+    return {
+        "request_id": str(rid),
+        "emp_code": emp_code,
+        "employee_name": emp[0]["name"] if emp else None,
+        "status": status,
+        "reason": reason,
+        "fields": [
+            {"field": c["field"], "current": c.get("current_value"), "requested": c["requested_value"]}
+            for c in fields
+        ],
+        "reviewed_by": r.get("reviewed_by"),
+        "review_comment": r.get("review_comment"),
+        "created_at": created_at.isoformat(),
+    }
+
+
+async def _reopen(request_ids: list, now: datetime) -> None:
+    """Put approved requests whose changes could not be applied back to pending."""
+    await UpdateRequest.get_motor_collection().update_many(
+        {"_id": {"$in": request_ids}},
+        {"$set": {
+            "status": "pending", "reviewed_by": None, "review_comment": None,
+            "reviewed_at": None, "updated_at": now,
+        }},
+    )
+
 
 class UpdateRequestService:
     """Handles employee profile-update requests."""
@@ -37,37 +98,32 @@ class UpdateRequestService:
             fields: Dict of {field_name: desired_new_value}
             reason: Why the change is needed
         """
-        emp = await self._emp_repo.find_by_emp_code(emp_code.upper())
+        # Reject malformed requests before touching the DB
+        if not fields:
+            return {"error": f"No fields to change. Allowed: {_ALLOWED_FIELDS_LIST}"}
+        invalid = fields.keys() - _ALLOWED_FIELDS
+        if invalid:
+            return {"error": f"You cannot request changes to: {', '.join(invalid)}. Allowed: {_ALLOWED_FIELDS_LIST}"}
+
+        emp = await self._emp_repo.find_by_emp_code(emp_code)
         if not emp:
             return {"error": f"Employee {emp_code} not found."}
 
-        # Only allow safe fields to be changed by employees
-        ALLOWED_FIELDS = {
-            "name", "email", "department", "designation",
-            "manager_name",
-        }
-        invalid = set(fields.keys()) - ALLOWED_FIELDS
-        if invalid:
-            return {"error": f"You cannot request changes to: {', '.join(invalid)}. Allowed: {', '.join(sorted(ALLOWED_FIELDS))}"}
-
-        # Build field-change entries with current values
-        changes = []
-        for field, new_value in fields.items():
-            current = str(getattr(emp, field, "")) if hasattr(emp, field) else ""
-            changes.append(FieldChange(
-                field=field,
-                current_value=current,
-                requested_value=str(new_value),
-            ))
+        # Build field-change entries with current values, validated in one call
+        changes = _FIELD_CHANGES.validate_python([
+            {"field": field, "current_value": str(getattr(emp, field)), "requested_value": str(new_value)}
+            for field, new_value in fields.items()
+        ])
 
-        req = UpdateRequest(
-            emp_code=emp_code.upper(),
-            employee_name=emp.name,
+        now = datetime.now(timezone.utc)
+        # `changes` are already-built FieldChange models; skip re-validation
+        req = UpdateRequest.model_construct(
+            emp_code=emp_code,
             requested_fields=changes,
             reason=reason,
             status="pending",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
         await req.insert()
 
@@ -93,27 +149,28 @@ class UpdateRequestService:
         if status:
             query["status"] = status
         if emp_code:
-            query["emp_code"] = emp_code.upper()
-
-        requests = await UpdateRequest.find(query).sort("-created_at").limit(50).to_list()
-
-        return [
-            {
-                "request_id": str(r.id),
-                "emp_code": r.emp_code,
-                "employee_name": r.employee_name,
-                "status": r.status,
-                "reason": r.reason,
-                "fields": [
-                    {"field": c.field, "current": c.current_value, "requested": c.requested_value}
-                    for c in r.requested_fields
-                ],
-                "reviewed_by": r.reviewed_by,
-                "review_comment": r.review_comment,
-                "created_at": r.created_at.isoformat(),
-            }
-            for r in requests
+            query["emp_code"] = emp_code
+
+        # Narrow to the page first, then join just the employee name. The
+        # whole page resolves in this one round-trip; each join is a seek on
+        # the unique emp_code index, so no per-row or $in follow-up is needed
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"created_at": -1}},
+            {"$limit": 50},
+            # Only the fields the listing renders
+            {"$project": _LIST_FIELDS},
+            {"$lookup": {
+                "from": Employee.get_collection_name(),
+                "localField": "emp_code",
+                "foreignField": "emp_code",
+                "pipeline": [{"$limit": 1}, {"$project": {"_id": 0, "name": 1}}],
+                "as": "_emp",
+            }},
         ]
+        requests = await UpdateRequest.aggregate(pipeline).to_list()
+
+        return [_list_row(r) for r in requests]
 
     # ── Approve / Reject ─────────────────────────────────
 
@@ -125,11 +182,25 @@ class UpdateRequestService:
         comment: Optional[str] = None,
     ) -> dict:
         """HR/manager approves or rejects an update request."""
-        from bson import ObjectId
+        if not ObjectId.is_valid(request_id):
+            return {"error": f"Invalid update request id '{request_id}'."}
 
-        req = await UpdateRequest.get(ObjectId(request_id))
-        if not req:
+        # Fetch the request and its employee's editable fields in one round-trip
+        rows = await UpdateRequest.aggregate([
+            {"$match": {"_id": ObjectId(request_id)}},
+            {"$lookup": {
+                "from": Employee.get_collection_name(),
+                "localField": "emp_code",
+                "foreignField": "emp_code",
+                "pipeline": [{"$limit": 1}, {"$project": _EMP_REVIEW_FIELDS}],
+                "as": "_emp",
+            }},
+        ]).to_list()
+        if not rows:
             return {"error": f"Update request '{request_id}' not found."}
+        emp_rows = rows[0].pop("_emp")
+        req = UpdateRequest.model_validate(rows[0])
+        emp_name = emp_rows[0]["name"] if emp_rows else None
 
         if req.status != "pending":
             return {"error": f"Request is already '{req.status}'. Cannot {action}."}
@@ -138,41 +209,151 @@ class UpdateRequestService:
         if action_lower not in ("approve", "reject"):
             return {"error": "Action must be 'approve' or 'reject'."}
 
+        now = datetime.now(timezone.utc)
+        review = {
+            "reviewed_by": reviewer_email,
+            "review_comment": comment,
+            "reviewed_at": now,
+            "updated_at": now,
+        }
+
+        to_apply = []
         if action_lower == "approve":
-            # Apply changes to Employee document
-            emp = await self._emp_repo.find_by_emp_code(req.emp_code)
-            if not emp:
+            if not emp_rows:
                 return {"error": f"Employee {req.emp_code} not found. Cannot apply changes."}
+            # $set only the requested fields that actually differ
+            emp = emp_rows[0]
+            to_apply = [
+                c for c in req.requested_fields
+                if c.field in _ALLOWED_FIELDS and str(emp.get(c.field)) != c.requested_value
+            ]
+            new_status = "approved"
+        else:
+            new_status = "rejected"
 
-            applied = []
-            for change in req.requested_fields:
-                if hasattr(emp, change.field):
-                    setattr(emp, change.field, change.requested_value)
-                    applied.append(f"{change.field}: {change.current_value} → {change.requested_value}")
-            emp.updated_at = datetime.utcnow()
-            await self._emp_repo.update(emp)
-
-            req.status = "approved"
-            req.reviewed_by = reviewer_email
-            req.review_comment = comment
-            req.reviewed_at = datetime.utcnow()
-            req.updated_at = datetime.utcnow()
-            await req.save()
+        # Claim the request first, filtered on pending, so a concurrent review
+        # cannot also transition it; changes are only applied by the winner
+        result = await UpdateRequest.find_one(
+            {"_id": req.id, "status": "pending"}
+        ).update({"$set": {"status": new_status, **review}})
+        if not result.matched_count:
+            return {"error": f"Request '{request_id}' was reviewed by someone else in the meantime."}
 
+        if new_status == "rejected":
             return {
                 "success": True,
-                "message": f"Request approved. Changes applied to {req.emp_code} ({req.employee_name}): {'; '.join(applied)}.",
+                "message": f"Request rejected for {req.emp_code} ({emp_name or 'unknown'}). Comment: {comment or 'No comment'}.",
             }
-
-        else:  # reject
-            req.status = "rejected"
-            req.reviewed_by = reviewer_email
-            req.review_comment = comment
-            req.reviewed_at = datetime.utcnow()
-            req.updated_at = datetime.utcnow()
-            await req.save()
-
+        if not to_apply:
+            # Stale resubmission — the employee already has these values
             return {
                 "success": True,
-                "message": f"Request rejected for {req.emp_code} ({req.employee_name}). Comment: {comment or 'No comment'}.",
+                "message": f"Request approved. {req.emp_code} ({emp_name}) already has the requested values; nothing to change.",
             }
+
+        updates = {c.field: c.requested_value for c in to_apply}
+        updates["updated_at"] = now
+        try:
+            found = await self._emp_repo.set_by_emp_code(req.emp_code, updates)
+        except DuplicateKeyError:
+            await _reopen([req.id], now)
+            return {"error": f"Cannot apply changes to {req.emp_code}: email '{updates.get('email')}' is already used by another employee."}
+        if not found:
+            await _reopen([req.id], now)
+            return {"error": f"Employee {req.emp_code} not found. Cannot apply changes."}
+
+        applied = "; ".join(f"{c.field}: {c.current_value} → {c.requested_value}" for c in to_apply)
+        return {
+            "success": True,
+            "message": f"Request approved. Changes applied to {req.emp_code} ({updates.get('name', emp_name)}): {applied}.",
+        }
+
+    async def review_requests_bulk(
+        self,
+        request_ids: list[str],
+        action: str,           # "approve" or "reject"
+        reviewer_email: str,
+        comment: Optional[str] = None,
+    ) -> dict:
+        """Approve or reject many pending update requests at once.
+
+        The requests are transitioned first, in one bulk_write filtered on
+        ``status: "pending"``; only the ones this call actually moved have
+        their changes applied, in a second bulk_write with one op per
+        employee. Requests whose employee update fails go back to pending.
+        Ids that are malformed, missing or no longer pending (and, on
+        approval, requests whose employee no longer exists) are skipped.
+        """
+        action_lower = action.lower().strip()
+        if action_lower not in ("approve", "reject"):
+            return {"error": "Action must be 'approve' or 'reject'."}
+
+        oids = [ObjectId(rid) for rid in request_ids if ObjectId.is_valid(rid)]
+        # Oldest first, so later requests for the same employee win
+        reqs = await UpdateRequest.find(
+            {"_id": {"$in": oids}, "status": "pending"}
+        ).sort("created_at").to_list()
+        if action_lower == "approve":
+            existing = set(await Employee.get_motor_collection().distinct(
+                "emp_code", {"emp_code": {"$in": list({r.emp_code for r in reqs})}}
+            ))
+            reqs = [r for r in reqs if r.emp_code in existing]
+        if not reqs:
+            return {"error": "No pending update requests found for the given ids."}
+
+        now = datetime.now(timezone.utc)
+        review = {
+            "status": "approved" if action_lower == "approve" else "rejected",
+            "reviewed_by": reviewer_email,
+            "review_comment": comment,
+            "reviewed_at": now,
+            "updated_at": now,
+        }
+        req_coll = UpdateRequest.get_motor_collection()
+        req_result = await req_coll.bulk_write(
+            [UpdateOne({"_id": r.id, "status": "pending"}, {"$set": review}) for r in reqs],
+            ordered=False,
+        )
+        if req_result.modified_count < len(reqs):
+            # A concurrent review took some of them; keep only the ones this
+            # call's own review stamp landed on
+            mine = set(await req_coll.distinct("_id", {
+                "_id": {"$in": [r.id for r in reqs]},
+                "reviewed_by": reviewer_email,
+                "reviewed_at": now,
+            }))
+            reqs = [r for r in reqs if r.id in mine]
+
+        emp_matched = 0
+        if action_lower == "approve" and reqs:
+            # Merge per employee, oldest first, so each employee gets one $set
+            by_emp: dict[str, dict] = {}
+            for r in reqs:
+                by_emp.setdefault(r.emp_code, {}).update(
+                    (c.field, c.requested_value)
+                    for c in r.requested_fields
+                    if c.field in _ALLOWED_FIELDS
+                )
+            emp_codes = list(by_emp)
+            emp_ops = [
+                UpdateOne({"emp_code": code}, {"$set": {**updates, "updated_at": now}})
+                for code, updates in by_emp.items()
+            ]
+            try:
+                emp_result = await Employee.get_motor_collection().bulk_write(emp_ops, ordered=False)
+                emp_matched = emp_result.matched_count
+            except BulkWriteError as exc:
+                # e.g. a requested email already taken; un-approve those requests
+                emp_matched = exc.details["nMatched"]
+                failed = {emp_codes[err["index"]] for err in exc.details["writeErrors"]}
+                await _reopen([r.id for r in reqs if r.emp_code in failed], now)
+                reqs = [r for r in reqs if r.emp_code not in failed]
+
+        reviewed = {str(r.id) for r in reqs}
+        return {
+            "success": True,
+            "reviewed": len(reviewed),
+            "employees_updated": emp_matched,
+            "skipped": [rid for rid in request_ids if rid not in reviewed],
+            "message": f"{review['status'].title()} {len(reviewed)} update request(s).",
+        }